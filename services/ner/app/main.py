@@ -8,27 +8,94 @@ This service acts as a cheap filter in the opinion extraction pipeline:
 2. Only chunks with persons are sent to LLM for opinion extraction (slow, expensive)
 """
 
+import asyncio
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from transformers import pipeline
 
 MODEL_ID = "r1char9/ner-rubert-tiny-news"
+BATCH_SIZE = int(os.environ.get("NER_BATCH_SIZE", "16"))
+# "torch" (default) or "onnx-int8" (requires optimum[onnxruntime])
+NER_BACKEND = os.environ.get("NER_BACKEND", "torch")
+ONNX_DIR = Path(os.environ.get("NER_ONNX_DIR", "/tmp/ner-onnx-int8"))
+# Entities for recently seen texts; re-sent chunks skip the model (0 disables)
+NER_CACHE_SIZE = int(os.environ.get("NER_CACHE_SIZE", "10000"))
+# Longer texts are rarely re-sent verbatim and would dominate cache memory
+MAX_CACHED_TEXT_LENGTH = 4096
+# Threads running inference. torch already spreads one call across all cores,
+# so more workers only help with a lowered torch.set_num_threads
+NER_WORKERS = int(os.environ.get("NER_WORKERS", "1"))
 
 app = FastAPI(
     title="ru-person-ner",
     version="1.0.0",
     description="Lightweight Russian NER service for detecting person mentions",
+    default_response_class=ORJSONResponse,
 )
 
+
+def _load_onnx_int8_pipeline():
+    """Export the model to ONNX, quantize it to int8 and wrap it in a pipeline.
+
+    The quantized model is cached in ONNX_DIR so restarts skip the export.
+    """
+    from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+
+    quantized_file = "model_quantized.onnx"
+    if not (ONNX_DIR / quantized_file).exists():
+        model = ORTModelForTokenClassification.from_pretrained(MODEL_ID, export=True)
+        quantizer = ORTQuantizer.from_pretrained(model)
+        quantizer.quantize(
+            save_dir=ONNX_DIR,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False),
+        )
+        model.config.save_pretrained(ONNX_DIR)
+
+    return pipeline(
+        task="ner",
+        model=ORTModelForTokenClassification.from_pretrained(ONNX_DIR, file_name=quantized_file),
+        tokenizer=AutoTokenizer.from_pretrained(MODEL_ID),
+        aggregation_strategy="simple",
+    )
+
+
 # Load model once at startup
-ner = pipeline(
-    task="ner",
-    model=MODEL_ID,
-    aggregation_strategy="simple",  # merges sub-tokens into full entities
+if NER_BACKEND == "onnx-int8":
+    ner = _load_onnx_int8_pipeline()
+else:
+    ner = pipeline(
+        task="ner",
+        model=MODEL_ID,
+        aggregation_strategy="simple",  # merges sub-tokens into full entities
+    )
+
+# Person labels as the pipeline reports them: raw ("B-PER") and aggregated ("PER")
+_PERSON_LABELS = frozenset(
+    label
+    for raw in ner.model.config.id2label.values()
+    for label in (raw, raw.split("-", 1)[-1])
+    if "PER" in label.upper()
 )
 
+# LRU of pipeline output keyed by text, guarded by a lock since inference
+# runs concurrently on the _POOL workers (NER_WORKERS threads)
+_ENTITY_CACHE: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# Dedicated inference pool: requests queue here instead of piling onto
+# Starlette's shared threadpool, which stays free for health checks
+_POOL = ThreadPoolExecutor(max_workers=NER_WORKERS, thread_name_prefix="ner")
+
 
 class NerRequest(BaseModel):
     """Request model for NER endpoint."""
@@ -69,8 +136,7 @@ class HealthResponse(BaseModel):
 
 def _is_person(ent: dict[str, Any]) -> bool:
     """Check if entity is a person."""
-    label = (ent.get("entity_group") or ent.get("entity") or "").upper()
-    return "PER" in label or "PERSON" in label
+    return (ent.get("entity_group") or ent.get("entity")) in _PERSON_LABELS
 
 
 def _extract_persons(text: str, return_raw: bool = False) -> NerResponse:
@@ -83,22 +149,56 @@ def _extract_persons(text: str, return_raw: bool = False) -> NerResponse:
     Returns:
         NerResponse with extracted persons
     """
-    ents = ner(text)
+    return _build_response(_run_ner([text])[0], return_raw)
+
 
-    persons: list[str] = []
-    for e in ents:
-        if _is_person(e):
-            word = (e.get("word") or "").strip()
-            if word:
-                persons.append(word)
+def _run_ner(texts: list[str]) -> list[list[dict[str, Any]]]:
+    """Run the pipeline on texts, serving repeats from the entity cache.
 
+    Args:
+        texts: Russian texts to analyze
+
+    Returns:
+        Pipeline entities for each text, in input order
+    """
+    results: list[list[dict[str, Any]] | None] = [None] * len(texts)
+    misses: list[int] = []
+    with _CACHE_LOCK:
+        for i, text in enumerate(texts):
+            ents = _ENTITY_CACHE.get(text)
+            if ents is None:
+                misses.append(i)
+            else:
+                _ENTITY_CACHE.move_to_end(text)
+                results[i] = ents
+
+    if misses:
+        # One pipeline call lets transformers run the texts through the model in batches
+        computed = ner([texts[i] for i in misses], batch_size=BATCH_SIZE)
+        with _CACHE_LOCK:
+            for i, ents in zip(misses, computed):
+                results[i] = ents
+                if NER_CACHE_SIZE > 0 and len(texts[i]) <= MAX_CACHED_TEXT_LENGTH:
+                    _ENTITY_CACHE[texts[i]] = ents
+                    if len(_ENTITY_CACHE) > NER_CACHE_SIZE:
+                        _ENTITY_CACHE.popitem(last=False)
+
+    return results
+
+
+def _build_response(ents: list[dict[str, Any]], return_raw: bool = False) -> NerResponse:
+    """Build a NerResponse from raw pipeline entities.
+
+    Args:
+        ents: Entities returned by the NER pipeline for one text
+        return_raw: Whether to include raw NER spans
+
+    Returns:
+        NerResponse with extracted persons
+    """
+    words = ((e.get("word") or "").strip() for e in ents if _is_person(e))
     # Deduplicate while preserving order
-    seen: set[str] = set()
-    unique: list[str] = []
-    for p in persons:
-        if p not in seen:
-            seen.add(p)
-            unique.append(p)
+    unique = list(dict.fromkeys(w for w in words if w))
 
     return NerResponse(
         persons=unique,
@@ -118,7 +218,7 @@ def health_check() -> HealthResponse:
 
 
 @app.post("/ner/persons", response_model=NerResponse)
-def ner_persons(req: NerRequest) -> NerResponse:
+async def ner_persons(req: NerRequest) -> NerResponse:
     """Extract person entities from Russian text.
 
     This endpoint detects mentions of people in the input text.
@@ -128,11 +228,12 @@ def ner_persons(req: NerRequest) -> NerResponse:
         Input: "Иванов раскритиковал Петрова, а Кузнецова похвалил."
         Output: {"persons": ["Иванов", "Петрова", "Кузнецова"], "has_persons": true}
     """
-    return _extract_persons(req.text, req.return_raw)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_POOL, _extract_persons, req.text, req.return_raw)
 
 
 @app.post("/ner/persons/batch", response_model=NerBatchResponse)
-def ner_persons_batch(req: NerBatchRequest) -> NerBatchResponse:
+async def ner_persons_batch(req: NerBatchRequest) -> NerBatchResponse:
     """Extract person entities from multiple texts.
 
     This endpoint processes a batch of texts and returns results for each.
@@ -142,7 +243,9 @@ def ner_persons_batch(req: NerBatchRequest) -> NerBatchResponse:
         Input: {"texts": ["Иванов met Петров.", "No persons here."], "return_raw": false}
         Output: {"results": [...], "total_with_persons": 1}
     """
-    results = [_extract_persons(text, req.return_raw) for text in req.texts]
+    loop = asyncio.get_running_loop()
+    all_ents = await loop.run_in_executor(_POOL, _run_ner, req.texts)
+    results = [_build_response(ents, req.return_raw) for ents in all_ents]
     total_with_persons = sum(1 for r in results if r.has_persons)
 
     return NerBatchResponse(
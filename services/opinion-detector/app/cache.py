@@ -0,0 +1,92 @@
+"""In-process response caches for Opinion Detector Service."""
+
+import math
+import operator
+import threading
+from collections import OrderedDict
+
+from .schemas import DetectResponse
+
+
+def _normalize(vector: list[float]) -> list[float]:
+    """Scale vector to unit length so a dot product is cosine similarity."""
+    norm = math.sqrt(sum(map(operator.mul, vector, vector))) or 1.0
+    return [x / norm for x in vector]
+
+
+class SemanticResponseCache:
+    """Reuse detections for near-duplicate texts with the same persons list.
+
+    Entries are stored per exact persons tuple, so a lookup only scans
+    cached answers whose candidate targets are identical. Each group keeps
+    at most max_entries_per_group texts (least recently used evicted first),
+    and the number of groups is capped at max_groups the same way. A hit
+    also requires every cached opinion span to still be a substring of the
+    new text.
+
+    lookup() is a linear scan; call it off the event loop.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.98,
+        max_entries_per_group: int = 256,
+        max_groups: int = 1024,
+    ) -> None:
+        self.threshold = threshold
+        self.max_entries_per_group = max_entries_per_group
+        self.max_groups = max_groups
+        self._groups: OrderedDict[
+            tuple[str, ...], OrderedDict[str, tuple[list[float], DetectResponse]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, embedding: list[float], persons: tuple[str, ...], text: str
+    ) -> DetectResponse | None:
+        """Return the most similar cached response above threshold, if any."""
+        query = _normalize(embedding)
+        with self._lock:
+            group = self._groups.get(persons)
+            if not group:
+                return None
+            # Snapshot so the scan runs without holding the lock
+            entries = list(group.items())
+
+        best_text = None
+        best_response = None
+        best_score = self.threshold
+        for cached_text, (vector, response) in entries:
+            score = sum(map(operator.mul, query, vector))
+            if score >= best_score and all(s in text for s in response.opinion_spans):
+                best_text, best_response, best_score = cached_text, response, score
+        if best_text is None:
+            return None
+
+        with self._lock:
+            group = self._groups.get(persons)
+            if group is not None and best_text in group:
+                group.move_to_end(best_text)
+                self._groups.move_to_end(persons)
+        return best_response
+
+    def put(
+        self,
+        embedding: list[float],
+        persons: tuple[str, ...],
+        text: str,
+        response: DetectResponse,
+    ) -> None:
+        """Store a response; evicts the least recently used entry when full."""
+        vector = _normalize(embedding)
+        with self._lock:
+            group = self._groups.get(persons)
+            if group is None:
+                group = self._groups[persons] = OrderedDict()
+                if len(self._groups) > self.max_groups:
+                    self._groups.popitem(last=False)
+            group[text] = (vector, response)
+            group.move_to_end(text)
+            self._groups.move_to_end(persons)
+            if len(group) > self.max_entries_per_group:
+                group.popitem(last=False)
@@ -2,111 +2,412 @@
 
 import os
 import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import msgspec
+import orjson
+
 # Allow override via environment variable for Docker flexibility
 DB_PATH = Path(os.environ.get("OPINION_DB_PATH", "data/opinions.db"))
 
+# Bump when the CREATE TABLE statements change so init_db() reapplies the DDL
+SCHEMA_VERSION = 3
+
+# NORMAL is durable under WAL except for power loss; OFF trades that away
+# for faster bulk rebuilds
+DB_SYNCHRONOUS = os.environ.get("OPINION_DB_SYNCHRONOUS", "NORMAL").upper()
+if DB_SYNCHRONOUS not in ("OFF", "NORMAL", "FULL"):
+    raise RuntimeError(
+        f"OPINION_DB_SYNCHRONOUS must be OFF, NORMAL or FULL, got: {DB_SYNCHRONOUS}"
+    )
+
+# Per-connection tuning. journal_mode=WAL is persistent and set once in init_db().
+_CONNECTION_PRAGMAS = (
+    f"PRAGMA synchronous={DB_SYNCHRONOUS};",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA cache_size=-65536;",
+)
+
+# Single long-lived connection shared by all helpers, guarded by a lock
+_CONN: sqlite3.Connection | None = None
+_LOCK = threading.Lock()
+
+# Separate read-only connection so GET lookups don't queue behind writes
+_RO_CONN: sqlite3.Connection | None = None
+_RO_LOCK = threading.Lock()
+
+# Recently read or written detections keyed by chunk_id; upserts write through
+_DETECTION_CACHE_SIZE = int(os.environ.get("OPINION_DB_CACHE_SIZE", "4096"))
+_DETECTION_CACHE: OrderedDict[str, dict[str, Any]] = OrderedDict()
+# Bumped on every write; a read only populates the cache if no write raced it
+_write_seq = 0
+
+# SQL is kept at module scope so the connection's statement cache
+# reuses the compiled statements across calls.
+# WITHOUT ROWID clusters rows on chunk_id, so lookups by chunk_id
+# read the row straight from the primary-key b-tree.
+# The *_json columns hold msgpack-encoded lists; rows written before the
+# switch still hold JSON text and are decoded by _unpack_list().
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS opinion_detection (
+        chunk_id TEXT PRIMARY KEY,
+        start REAL NOT NULL,
+        end REAL NOT NULL,
+        persons_json BLOB NOT NULL,
+        has_opinion INTEGER NOT NULL,
+        targets_json BLOB NOT NULL,
+        spans_json BLOB NOT NULL,
+        polarity TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        created_at TEXT NOT NULL
+    ) WITHOUT ROWID;
+"""
+
+# Raw model output keyed by a hash of model + full prompt, so identical
+# requests on re-runs skip the API call
+_CREATE_RESPONSE_CACHE_SQL = """
+    CREATE TABLE IF NOT EXISTS llm_response_cache (
+        hash TEXT PRIMARY KEY,
+        response TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    ) WITHOUT ROWID;
+"""
+
+# Chunks submitted to the OpenAI Batch API, held until their results are ingested
+_CREATE_BATCH_ITEMS_SQL = """
+    CREATE TABLE IF NOT EXISTS openai_batch_item (
+        batch_id TEXT NOT NULL,
+        chunk_id TEXT NOT NULL,
+        start REAL NOT NULL,
+        end REAL NOT NULL,
+        persons_json BLOB NOT NULL,
+        text TEXT NOT NULL,
+        PRIMARY KEY (batch_id, chunk_id)
+    ) WITHOUT ROWID;
+"""
+
+_UPSERT_ON_CONFLICT = """
+    ON CONFLICT(chunk_id) DO UPDATE SET
+        start=excluded.start,
+        end=excluded.end,
+        persons_json=excluded.persons_json,
+        has_opinion=excluded.has_opinion,
+        targets_json=excluded.targets_json,
+        spans_json=excluded.spans_json,
+        polarity=excluded.polarity,
+        confidence=excluded.confidence,
+        created_at=excluded.created_at
+    RETURNING chunk_id, start, end, persons_json AS persons, has_opinion,
+              targets_json AS targets, spans_json AS opinion_spans, polarity, confidence, created_at;
+"""
+
+_UPSERT_DETECTION_SQL = f"""
+    INSERT INTO opinion_detection
+    (chunk_id, start, end, persons_json, has_opinion, targets_json, spans_json, polarity, confidence, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    {_UPSERT_ON_CONFLICT}"""
+
+# Bulk upserts pack many rows into one multi-VALUES statement, staying under
+# SQLite's conservative 999 bound-parameter limit.
+_DETECTION_COLUMNS = 10
+_MAX_SQL_PARAMS = 999
+_BULK_ROWS_PER_STATEMENT = _MAX_SQL_PARAMS // _DETECTION_COLUMNS
+
+
+@lru_cache(maxsize=8)
+def _bulk_upsert_sql(n_rows: int) -> str:
+    """Build (and cache) an upsert statement with n_rows VALUES groups."""
+    placeholders = ", ".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"] * n_rows)
+    return f"""
+    INSERT INTO opinion_detection
+    (chunk_id, start, end, persons_json, has_opinion, targets_json, spans_json, polarity, confidence, created_at)
+    VALUES {placeholders}
+    {_UPSERT_ON_CONFLICT}"""
+
+
+_SELECT_DETECTION_SQL = """
+    SELECT chunk_id, start, end, persons_json AS persons, has_opinion,
+           targets_json AS targets, spans_json AS opinion_spans, polarity, confidence, created_at
+    FROM opinion_detection
+    WHERE chunk_id = ?
+"""
+
+_SELECT_RESPONSE_SQL = """
+    SELECT response FROM llm_response_cache
+    WHERE hash = ? AND created_at >= ?
+"""
+
+_UPSERT_RESPONSE_SQL = """
+    INSERT INTO llm_response_cache (hash, response, created_at)
+    VALUES (?, ?, ?)
+    ON CONFLICT(hash) DO UPDATE SET
+        response=excluded.response,
+        created_at=excluded.created_at
+"""
+
+_INSERT_BATCH_ITEM_SQL = """
+    INSERT OR REPLACE INTO openai_batch_item (batch_id, chunk_id, start, end, persons_json, text)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT_BATCH_ITEMS_SQL = """
+    SELECT chunk_id, start, end, persons_json AS persons, text
+    FROM openai_batch_item
+    WHERE batch_id = ?
+"""
+
+_DELETE_BATCH_ITEMS_SQL = "DELETE FROM openai_batch_item WHERE batch_id = ?"
+
+
+# Detection lists are stored in SQLite as msgpack blobs
+_list_encoder = msgspec.msgpack.Encoder()
+_list_decoder = msgspec.msgpack.Decoder(list[str])
+
+
+def pack_list(values: list[str]) -> bytes:
+    """Encode a string list for storage in a *_json column."""
+    return _list_encoder.encode(values)
+
+
+def _unpack_list(value: bytes | str) -> list[str]:
+    """Decode a stored list column (msgpack blob or legacy JSON text)."""
+    if isinstance(value, str):
+        return orjson.loads(value)
+    return _list_decoder.decode(value)
+
 
 def _ensure_dirs() -> None:
     """Ensure database directory exists."""
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
 
-def init_db() -> None:
-    """Initialize database schema."""
-    _ensure_dirs()
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS opinion_detection (
-                chunk_id TEXT PRIMARY KEY,
-                start REAL NOT NULL,
-                end REAL NOT NULL,
-                persons_json TEXT NOT NULL,
-                has_opinion INTEGER NOT NULL,
-                targets_json TEXT NOT NULL,
-                spans_json TEXT NOT NULL,
-                polarity TEXT NOT NULL,
-                confidence REAL NOT NULL,
-                created_at TEXT NOT NULL
-            );
-            """
+def _connect() -> sqlite3.Connection:
+    """Open a connection with the tuned PRAGMAs applied."""
+    # IMMEDIATE takes the write lock when a write transaction begins,
+    # so concurrent writers wait on the busy timeout instead of failing to upgrade
+    conn = sqlite3.connect(
+        DB_PATH,
+        check_same_thread=False,
+        cached_statements=256,
+        isolation_level="IMMEDIATE",
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _get_conn() -> sqlite3.Connection:
+    """Return the shared connection, opening it on first use."""
+    global _CONN
+    if _CONN is None:
+        _ensure_dirs()
+        _CONN = _connect()
+    return _CONN
+
+
+def _get_ro_conn() -> sqlite3.Connection:
+    """Return the shared read-only connection, opening it on first use."""
+    global _RO_CONN
+    if _RO_CONN is None:
+        conn = sqlite3.connect(
+            f"file:{DB_PATH}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=256,
         )
-        conn.commit()
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute("PRAGMA query_only=1;")
+        _RO_CONN = conn
+    return _RO_CONN
+
+
+def init_db() -> None:
+    """Initialize database schema.
+
+    Skips DDL when PRAGMA user_version already matches SCHEMA_VERSION.
+    """
+    conn = _get_conn()
+    with _LOCK, conn:
+        (version,) = conn.execute("PRAGMA user_version;").fetchone()
+        if version == SCHEMA_VERSION:
+            return
+        # WAL lets readers proceed while a batch is being persisted
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute(_CREATE_TABLE_SQL)
+        conn.execute(_CREATE_RESPONSE_CACHE_SQL)
+        conn.execute(_CREATE_BATCH_ITEMS_SQL)
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION};")
+
+
+def _row_to_detection(row: sqlite3.Row) -> dict[str, Any]:
+    """Convert a stored row into response shape, decoding list columns."""
+    detection = dict(row)
+    detection["has_opinion"] = bool(detection["has_opinion"])
+    for key in ("persons", "targets", "opinion_spans"):
+        detection[key] = _unpack_list(detection[key])
+    return detection
+
+
+def _cache_detection(detection: dict[str, Any]) -> None:
+    """Insert into the LRU cache, evicting the oldest entry. Caller must hold _LOCK."""
+    _DETECTION_CACHE[detection["chunk_id"]] = detection
+    _DETECTION_CACHE.move_to_end(detection["chunk_id"])
+    if len(_DETECTION_CACHE) > _DETECTION_CACHE_SIZE:
+        _DETECTION_CACHE.popitem(last=False)
+
+
+def _write_through(rows: list[sqlite3.Row]) -> list[dict[str, Any]]:
+    """Cache rows returned by a committed upsert. Caller must hold _LOCK."""
+    global _write_seq
+    _write_seq += 1
+    detections = [_row_to_detection(row) for row in rows]
+    for detection in detections:
+        _cache_detection(detection)
+    return detections
 
 
 def upsert_detection(
     chunk_id: str,
     start: float,
     end: float,
-    persons_json: str,
+    persons: bytes,
     has_opinion: int,
-    targets_json: str,
-    spans_json: str,
+    targets: bytes,
+    spans: bytes,
     polarity: str,
     confidence: float,
     created_at: str,
-) -> None:
-    """Insert or update detection result."""
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute(
-            """
-            INSERT INTO opinion_detection
-            (chunk_id, start, end, persons_json, has_opinion, targets_json, spans_json, polarity, confidence, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(chunk_id) DO UPDATE SET
-                start=excluded.start,
-                end=excluded.end,
-                persons_json=excluded.persons_json,
-                has_opinion=excluded.has_opinion,
-                targets_json=excluded.targets_json,
-                spans_json=excluded.spans_json,
-                polarity=excluded.polarity,
-                confidence=excluded.confidence,
-                created_at=excluded.created_at;
-            """,
-            (
-                chunk_id,
-                start,
-                end,
-                persons_json,
-                has_opinion,
-                targets_json,
-                spans_json,
-                polarity,
-                confidence,
-                created_at,
-            ),
-        )
-        conn.commit()
+) -> dict[str, Any]:
+    """Insert or update detection result.
+
+    persons, targets and spans are string lists encoded with pack_list().
+    Returns the stored row in get_detection() shape (via RETURNING, so no
+    second query is needed) and caches it for subsequent reads.
+    """
+    conn = _get_conn()
+    with _LOCK:
+        with conn:
+            row = conn.execute(
+                _UPSERT_DETECTION_SQL,
+                (
+                    chunk_id,
+                    start,
+                    end,
+                    persons,
+                    has_opinion,
+                    targets,
+                    spans,
+                    polarity,
+                    confidence,
+                    created_at,
+                ),
+            ).fetchone()
+        (detection,) = _write_through([row])
+    return detection
+
+
+def upsert_detections_bulk(rows: list[tuple[Any, ...]]) -> None:
+    """Insert or update many detection results in a single transaction.
+
+    Each row is a tuple in upsert_detection() argument order. Rows are
+    written with multi-row INSERT statements inside one BEGIN IMMEDIATE
+    transaction.
+    """
+    if not rows:
+        return
+    conn = _get_conn()
+    with _LOCK:
+        with conn:
+            stored = _bulk_upsert(conn, rows)
+        _write_through(stored)
+
+
+def _bulk_upsert(conn: sqlite3.Connection, rows: list[tuple[Any, ...]]) -> list[sqlite3.Row]:
+    """Run multi-row upserts in the caller's transaction and return the stored rows."""
+    stored: list[sqlite3.Row] = []
+    for i in range(0, len(rows), _BULK_ROWS_PER_STATEMENT):
+        batch = rows[i : i + _BULK_ROWS_PER_STATEMENT]
+        params = [value for row in batch for value in row]
+        stored.extend(conn.execute(_bulk_upsert_sql(len(batch)), params).fetchall())
+    return stored
 
 
 def get_detection(chunk_id: str) -> dict[str, Any] | None:
     """Retrieve detection result by chunk_id."""
-    with sqlite3.connect(DB_PATH) as conn:
-        cur = conn.execute(
-            """
-            SELECT chunk_id, start, end, persons_json, has_opinion,
-                   targets_json, spans_json, polarity, confidence, created_at
-            FROM opinion_detection
-            WHERE chunk_id = ?
-            """,
-            (chunk_id,),
-        )
-        row = cur.fetchone()
-        if not row:
-            return None
-        return {
-            "chunk_id": row[0],
-            "start": row[1],
-            "end": row[2],
-            "persons_json": row[3],
-            "has_opinion": bool(row[4]),
-            "targets_json": row[5],
-            "spans_json": row[6],
-            "polarity": row[7],
-            "confidence": row[8],
-            "created_at": row[9],
-        }
+    with _LOCK:
+        cached = _DETECTION_CACHE.get(chunk_id)
+        if cached is not None:
+            _DETECTION_CACHE.move_to_end(chunk_id)
+            return cached
+        seq = _write_seq
+
+    conn = _get_ro_conn()
+    with _RO_LOCK:
+        row = conn.execute(_SELECT_DETECTION_SQL, (chunk_id,)).fetchone()
+    if not row:
+        return None
+    # Decode once here so cached entries are already in response shape
+    detection = _row_to_detection(row)
+
+    with _LOCK:
+        if seq == _write_seq:
+            _cache_detection(detection)
+    return detection
+
+
+def get_cached_response(prompt_hash: str, not_before: str) -> str | None:
+    """Return a cached model response stored at or after not_before (ISO 8601)."""
+    conn = _get_ro_conn()
+    with _RO_LOCK:
+        row = conn.execute(_SELECT_RESPONSE_SQL, (prompt_hash, not_before)).fetchone()
+    return row["response"] if row else None
+
+
+def put_cached_response(prompt_hash: str, response: str, created_at: str) -> None:
+    """Insert or refresh a cached model response."""
+    conn = _get_conn()
+    with _LOCK, conn:
+        conn.execute(_UPSERT_RESPONSE_SQL, (prompt_hash, response, created_at))
+
+
+def add_batch_items(batch_id: str, items: list[tuple[Any, ...]]) -> None:
+    """Record chunks submitted to an OpenAI batch.
+
+    Each item is (chunk_id, start, end, persons, text) with persons encoded
+    by pack_list().
+    """
+    conn = _get_conn()
+    with _LOCK, conn:
+        conn.executemany(_INSERT_BATCH_ITEM_SQL, [(batch_id, *item) for item in items])
+
+
+def get_batch_items(batch_id: str) -> list[dict[str, Any]]:
+    """Return chunks of an OpenAI batch whose results are not yet stored."""
+    conn = _get_conn()
+    with _LOCK:
+        rows = conn.execute(_SELECT_BATCH_ITEMS_SQL, (batch_id,)).fetchall()
+    items = [dict(row) for row in rows]
+    for item in items:
+        item["persons"] = _unpack_list(item["persons"])
+    return items
+
+
+def complete_batch(batch_id: str, rows: list[tuple[Any, ...]]) -> None:
+    """Store an OpenAI batch's detections and drop its pending items atomically.
+
+    rows are tuples in upsert_detection() argument order.
+    """
+    conn = _get_conn()
+    with _LOCK:
+        with conn:
+            stored = _bulk_upsert(conn, rows)
+            conn.execute(_DELETE_BATCH_ITEMS_SQL, (batch_id,))
+        _write_through(stored)
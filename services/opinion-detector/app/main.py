@@ -10,28 +10,84 @@ This service is step 3 in the opinion extraction pipeline:
 4. (Optional) Opinion Extractor -> structured extraction
 """
 
-import json
+import asyncio
+import hashlib
 import logging
 import os
-from datetime import datetime, timezone
-
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import get_args
+
+import ahocorasick
+import httpx
+import msgspec
+import orjson
 from fastapi import FastAPI, HTTPException
-from openai import OpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential
-
-from .db import get_detection, init_db, upsert_detection
+from fastapi.responses import ORJSONResponse
+from openai import AsyncOpenAI
+from tenacity import retry, stop_after_attempt
+
+# Shared with src/ingest.py; copied next to the app package in the image
+from openai_retry import retry_if_transient, wait_retry_after
+
+from .cache import SemanticResponseCache
+from .db import (
+    add_batch_items,
+    complete_batch,
+    get_batch_items,
+    get_cached_response,
+    get_detection,
+    init_db,
+    pack_list,
+    put_cached_response,
+    upsert_detection,
+    upsert_detections_bulk,
+)
 from .schemas import (
+    BatchJobResponse,
     ChunkResponse,
+    DetectBatchOutput,
     DetectBatchRequest,
     DetectBatchResponse,
+    DetectOutput,
     DetectRequest,
     DetectResponse,
     HealthResponse,
+    Polarity,
 )
 
 # --- Configuration ---
 OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
 MAX_TEXT_LENGTH = int(os.environ.get("MAX_TEXT_LENGTH", "4000"))
+OPENAI_CONCURRENCY = int(os.environ.get("OPENAI_CONCURRENCY", "8"))
+# "json_schema" (strict structured outputs) or "json_object" for models without them
+OPENAI_RESPONSE_FORMAT = os.environ.get("OPENAI_RESPONSE_FORMAT", "json_schema")
+if OPENAI_RESPONSE_FORMAT not in ("json_schema", "json_object"):
+    raise RuntimeError(
+        f"OPENAI_RESPONSE_FORMAT must be json_schema or json_object, got: {OPENAI_RESPONSE_FORMAT}"
+    )
+# Semantic response cache: reuse a detection when a new text's embedding has at
+# least this cosine similarity to a cached one with the same persons (0 disables)
+SEMANTIC_CACHE_THRESHOLD = float(os.environ.get("SEMANTIC_CACHE_THRESHOLD", "0"))
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "text-embedding-3-small")
+# Exact response cache: reuse the stored model output for a byte-identical
+# prompt within this many hours (0 disables)
+RESPONSE_CACHE_TTL_HOURS = float(os.environ.get("RESPONSE_CACHE_TTL_HOURS", "0"))
+# Batch endpoint: pack up to this many chunks into one prompt (1 disables)
+BATCH_PROMPT_SIZE = int(os.environ.get("BATCH_PROMPT_SIZE", "1"))
+# Single endpoint: wait up to this long to group concurrent requests into one
+# prompt of up to BATCH_PROMPT_SIZE chunks (0 disables)
+BATCH_WAIT_MS = float(os.environ.get("BATCH_WAIT_MS", "0"))
+# OpenAI Batch API statuses after which no more results will arrive
+BATCH_API_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+# Low temperature for consistent extraction
+OPENAI_TEMPERATURE = 0.1
+# Upper bound for a single retry wait, including server Retry-After hints
+MAX_RETRY_WAIT = 10.0
+# Above this many spans, validate them in one Aho-Corasick pass over the text
+SPAN_AUTOMATON_THRESHOLD = 8
 
 # Validate API key
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
@@ -45,167 +101,540 @@ if not OPENAI_API_KEY:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Initialize the database and micro-batch worker; stop both on shutdown."""
+    init_db()
+    if MICRO_BATCHING:
+        _spawn(_batch_worker())
+    logger.info(f"Opinion Detector started with model: {OPENAI_MODEL}")
+    yield
+    await _stop_background_tasks()
+    await client.close()
+
+
 app = FastAPI(
     title="opinion-detector",
     version="1.0.0",
     description="Detects opinions about persons in Russian text using OpenAI",
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan,
 )
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# HTTP/2 lets concurrent batch requests multiplex over pooled keep-alive connections.
+# tenacity owns retries (see _complete_with_retry), so the SDK's own are disabled.
+client = AsyncOpenAI(
+    api_key=OPENAI_API_KEY,
+    max_retries=0,
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=30.0,
+    ),
+)
 
+# Decodes and validates model output in C
+_output_decoder = msgspec.json.Decoder(DetectOutput)
+_batch_output_decoder = msgspec.json.Decoder(DetectBatchOutput)
+
+# Constant results, built once without validation. Never mutate these.
+EMPTY_RESULT = DetectResponse.model_construct(
+    has_opinion=False,
+    targets=[],
+    opinion_spans=[],
+    polarity="unclear",
+    confidence=1.0,
+)
+FAILED_RESULT = DetectResponse.model_construct(
+    has_opinion=False,
+    targets=[],
+    opinion_spans=[],
+    polarity="unclear",
+    confidence=0.0,
+)
 
-@app.on_event("startup")
-def _startup() -> None:
-    """Initialize database on startup."""
-    init_db()
-    logger.info(f"Opinion Detector started with model: {OPENAI_MODEL}")
+# Opt-in: costs one embedding call per chunk with persons
+_semantic_cache = (
+    SemanticResponseCache(threshold=SEMANTIC_CACHE_THRESHOLD)
+    if SEMANTIC_CACHE_THRESHOLD > 0
+    else None
+)
 
+# Caps in-flight OpenAI requests so batch fan-out respects rate limits
+_openai_semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+
+# Micro-batching for the single endpoint: handlers enqueue (request, future)
+# and _batch_worker resolves them in groups
+MICRO_BATCHING = BATCH_WAIT_MS > 0 and BATCH_PROMPT_SIZE > 1
+_detect_queue: asyncio.Queue[tuple[DetectRequest, asyncio.Future]] = asyncio.Queue()
+# Strong references so running tasks aren't garbage-collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Start a background task and hold a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _stop_background_tasks() -> None:
+    """Cancel background tasks and wait until they have all finished."""
+    tasks = list(_background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Static instructions, serialized once. They travel in the system message so
+# every request shares a byte-identical prefix for provider-side prompt caching.
+_INSTRUCTIONS = {
+    "task": "Detect whether the author expresses an opinion about any PERSON in the text.",
+    "language": "ru",
+    "definitions": {
+        "opinion": (
+            "Any evaluative judgment, praise/blame, accusation, sarcasm/irony, "
+            "attribution of motives/intentions, predictions about a person, or conclusions about a person. "
+            "Pure factual mentions are NOT opinions."
+        )
+    },
+    "output_schema": {
+        "has_opinion": "boolean",
+        "targets": "array of strings (subset of persons)",
+        "opinion_spans": "array of short direct quotes copied from input text",
+        "polarity": "one of: negative, positive, mixed, unclear",
+        "confidence": "number 0..1",
+    },
+    "rules": [
+        "Return ONLY valid JSON. No extra text.",
+        "targets MUST be chosen only from provided persons list.",
+        "If has_opinion=false then targets must be empty and opinion_spans must be empty.",
+        "opinion_spans MUST be exact substrings from the input text (copy-paste).",
+        "If the text contains sarcasm or irony toward a person, mark has_opinion=true.",
+    ],
+}
+_OPINION_INSTRUCTIONS = orjson.dumps(_INSTRUCTIONS).decode()
+
+SYSTEM_PROMPT = (
+    "You are a strict information extraction engine. Return ONLY valid JSON.\n"
+    f"Instructions: {_OPINION_INSTRUCTIONS}"
+)
 
-def _build_prompt(req: DetectRequest) -> str:
-    """Build the prompt for OpenAI."""
-    payload = {
-        "task": "Detect whether the author expresses an opinion about any PERSON in the text.",
-        "language": "ru",
-        "definitions": {
-            "opinion": (
-                "Any evaluative judgment, praise/blame, accusation, sarcasm/irony, "
-                "attribution of motives/intentions, predictions about a person, or conclusions about a person. "
-                "Pure factual mentions are NOT opinions."
-            )
-        },
-        "input": {"text": req.text, "persons": req.persons},
+# Variant for multi-chunk prompts: same rules, one result per input item
+_BATCH_INSTRUCTIONS = orjson.dumps(
+    {
+        **_INSTRUCTIONS,
         "output_schema": {
-            "has_opinion": "boolean",
-            "targets": "array of strings (subset of persons)",
-            "opinion_spans": "array of short direct quotes copied from input text",
-            "polarity": "one of: negative, positive, mixed, unclear",
-            "confidence": "number 0..1",
+            "results": [{"id": "integer (id of the input item)", **_INSTRUCTIONS["output_schema"]}]
         },
         "rules": [
-            "Return ONLY valid JSON. No extra text.",
-            "targets MUST be chosen only from provided persons list.",
-            "If has_opinion=false then targets must be empty and opinion_spans must be empty.",
-            "opinion_spans MUST be exact substrings from the input text (copy-paste).",
-            "If the text contains sarcasm or irony toward a person, mark has_opinion=true.",
+            *_INSTRUCTIONS["rules"],
+            "Judge each input item independently; persons and spans refer to that item only.",
+            "Return one result object per input id in the same order.",
         ],
     }
-    return json.dumps(payload, ensure_ascii=False)
-
+).decode()
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
-    reraise=True,
+BATCH_SYSTEM_PROMPT = (
+    "You are a strict information extraction engine. Return ONLY valid JSON.\n"
+    f"Instructions: {_BATCH_INSTRUCTIONS}"
 )
-def _call_openai(prompt: str) -> DetectResponse:
-    """Call OpenAI API with retry logic."""
-    resp = client.chat.completions.create(
-        model=OPENAI_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a strict information extraction engine. Return ONLY valid JSON.",
+
+# Request fragments that never change, built once instead of per call
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+_BATCH_SYSTEM_MESSAGE = {"role": "system", "content": BATCH_SYSTEM_PROMPT}
+
+# Strict structured-output schemas mirroring DetectOutput / DetectBatchOutput.
+# Strict mode has no numeric bounds, so confidence's 0..1 range is still
+# enforced by the msgspec decoder.
+_DETECTION_PROPERTIES = {
+    "has_opinion": {"type": "boolean"},
+    "targets": {"type": "array", "items": {"type": "string"}},
+    "opinion_spans": {"type": "array", "items": {"type": "string"}},
+    "polarity": {"type": "string", "enum": list(get_args(Polarity))},
+    "confidence": {"type": "number"},
+}
+_DETECTION_SCHEMA = {
+    "type": "object",
+    "properties": _DETECTION_PROPERTIES,
+    "required": list(_DETECTION_PROPERTIES),
+    "additionalProperties": False,
+}
+_BATCH_DETECTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"id": {"type": "integer"}, **_DETECTION_PROPERTIES},
+                "required": ["id", *_DETECTION_PROPERTIES],
+                "additionalProperties": False,
             },
-            {"role": "user", "content": prompt},
-        ],
-        response_format={"type": "json_object"},
-        temperature=0.1,  # Low temperature for consistent extraction
-    )
+        }
+    },
+    "required": ["results"],
+    "additionalProperties": False,
+}
+
+
+def _response_format(name: str, schema: dict) -> dict:
+    """Build the response_format for OPENAI_RESPONSE_FORMAT."""
+    if OPENAI_RESPONSE_FORMAT == "json_object":
+        return {"type": "json_object"}
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+_RESPONSE_FORMAT = _response_format("opinion_detection", _DETECTION_SCHEMA)
+_BATCH_RESPONSE_FORMAT = _response_format("opinion_detection_batch", _BATCH_DETECTION_SCHEMA)
+
+
+# Hash state over everything that shapes the output besides the prompt: model,
+# system prompt, response format and temperature. Changing any of them yields new keys.
+_PROMPT_HASH_PREFIX = hashlib.blake2b(
+    "\0".join(
+        [
+            OPENAI_MODEL,
+            SYSTEM_PROMPT,
+            orjson.dumps(_RESPONSE_FORMAT, option=orjson.OPT_SORT_KEYS).decode(),
+            repr(OPENAI_TEMPERATURE),
+            "",
+        ]
+    ).encode(),
+    digest_size=16,
+)
 
-    text_out = resp.choices[0].message.content or ""
 
-    # Log token usage for cost monitoring
-    if resp.usage:
-        logger.debug(
-            f"Tokens used: {resp.usage.total_tokens} "
-            f"(prompt: {resp.usage.prompt_tokens}, completion: {resp.usage.completion_tokens})"
-        )
+def _prompt_hash(prompt: str) -> str:
+    """Key for the exact response cache."""
+    h = _PROMPT_HASH_PREFIX.copy()
+    h.update(prompt.encode())
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _build_prompt(text: str, persons: tuple[str, ...]) -> str:
+    """Build the per-chunk part of the prompt for OpenAI.
+
+    Only the dynamic input is serialized here; the static instructions live
+    in SYSTEM_PROMPT. Results are memoized so retries and re-runs of the same
+    chunk skip re-serialization.
+    """
+    return orjson.dumps({"input": {"text": text, "persons": persons}}).decode()
+
 
-    # Parse JSON
+def _build_batch_prompt(entries: list[tuple[str, tuple[str, ...]]]) -> str:
+    """Build the per-call part of a multi-chunk prompt from (text, persons) pairs.
+
+    Items are identified by their position in entries.
+    """
+    return orjson.dumps(
+        {
+            "items": [
+                {"id": i, "text": text, "persons": persons}
+                for i, (text, persons) in enumerate(entries)
+            ]
+        }
+    ).decode()
+
+
+async def _call_openai(prompt: str) -> DetectResponse:
+    """Call OpenAI API with retry logic.
+
+    With RESPONSE_CACHE_TTL_HOURS set, a fresh stored response for the same
+    prompt is reused instead of calling the API. Only the API call itself is
+    retried; the cache is read and written once.
+    """
+    cache_key = None
+    text_out = None
+    if RESPONSE_CACHE_TTL_HOURS > 0:
+        cache_key = _prompt_hash(prompt)
+        not_before = (
+            datetime.now(timezone.utc) - timedelta(hours=RESPONSE_CACHE_TTL_HOURS)
+        ).isoformat(timespec="milliseconds")
+        text_out = await asyncio.to_thread(get_cached_response, cache_key, not_before)
+        if text_out is not None:
+            logger.debug(f"Response cache hit: {cache_key}")
+            cache_key = None  # already stored
+
+    if text_out is None:
+        text_out = await _complete_with_retry(prompt)
+
+    # Parse and validate JSON in one pass; ValidationError propagates as before
     try:
-        data = json.loads(text_out)
-    except json.JSONDecodeError as e:
+        parsed = _output_decoder.decode(text_out)
+    except msgspec.ValidationError:
+        raise
+    except msgspec.DecodeError as e:
         raise HTTPException(
             status_code=502,
             detail=f"Model returned invalid JSON: {text_out[:500]}. Error: {e}",
         )
 
-    return DetectResponse(**data)
+    # Only responses that parsed cleanly are cached
+    if cache_key is not None:
+        await asyncio.to_thread(put_cached_response, cache_key, text_out, _utc_now_iso())
+
+    # Already validated by msgspec, so skip Pydantic validation
+    return DetectResponse.model_construct(**msgspec.structs.asdict(parsed))
+
+
+async def _complete(
+    prompt: str,
+    system_message: dict = _SYSTEM_MESSAGE,
+    response_format: dict = _RESPONSE_FORMAT,
+) -> str:
+    """Send the prompt to OpenAI and return the raw message content."""
+    async with _openai_semaphore:
+        resp = await client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[system_message, {"role": "user", "content": prompt}],
+            response_format=response_format,
+            temperature=OPENAI_TEMPERATURE,
+        )
+
+    # Log token usage for cost monitoring
+    if resp.usage:
+        # OpenAI caches the static system-message prefix automatically
+        details = resp.usage.prompt_tokens_details
+        cached = details.cached_tokens if details and details.cached_tokens else 0
+        logger.debug(
+            f"Tokens used: {resp.usage.total_tokens} "
+            f"(prompt: {resp.usage.prompt_tokens}, cached: {cached}, "
+            f"completion: {resp.usage.completion_tokens})"
+        )
+
+    return resp.choices[0].message.content or ""
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    retry=retry_if_transient,
+    wait=wait_retry_after(MAX_RETRY_WAIT),
+    reraise=True,
+)
+async def _complete_with_retry(prompt: str) -> str:
+    """_complete for a single-chunk prompt, retried on failure."""
+    return await _complete(prompt)
+
 
+async def _embed(text: str) -> list[float]:
+    """Embed text for the semantic response cache."""
+    async with _openai_semaphore:
+        resp = await client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    return resp.data[0].embedding
 
-def _detect_single(req: DetectRequest) -> DetectResponse:
+
+def _missing_spans(spans: list[str], text: str) -> list[str]:
+    """Return non-empty spans that are not substrings of text."""
+    spans = [s for s in spans if s]
+    if len(spans) <= SPAN_AUTOMATON_THRESHOLD:
+        return [s for s in spans if s not in text]
+
+    automaton = ahocorasick.Automaton()
+    for span in spans:
+        automaton.add_word(span, span)
+    automaton.make_automaton()
+    found = {span for _, span in automaton.iter(text)}
+    return [s for s in spans if s not in found]
+
+
+async def _detect_single(req: DetectRequest) -> DetectResponse:
     """Process a single detection request."""
     # If no persons, skip OpenAI call
     if not req.persons:
-        return DetectResponse(
-            has_opinion=False,
-            targets=[],
-            opinion_spans=[],
-            polarity="unclear",
-            confidence=1.0,
-        )
-
-    # Truncate text if too long
-    text = req.text
-    if len(text) > MAX_TEXT_LENGTH:
-        text = text[:MAX_TEXT_LENGTH] + "..."
-        req = DetectRequest(
-            chunk_id=req.chunk_id,
-            start=req.start,
-            end=req.end,
-            text=text,
-            persons=req.persons,
-        )
-        logger.warning(f"Truncated text for chunk {req.chunk_id} to {MAX_TEXT_LENGTH} chars")
+        return EMPTY_RESULT
+
+    text = _truncated_text(req)
+    persons = tuple(req.persons)
+
+    # Near-duplicate of an earlier chunk with the same persons? Reuse its answer.
+    embedding = None
+    if _semantic_cache is not None:
+        try:
+            embedding = await _embed(text)
+        except Exception as e:
+            logger.warning(f"Embedding failed for chunk {req.chunk_id}, skipping cache: {e}")
+        else:
+            # Linear scan over same-persons entries; keep it off the event loop
+            cached = await asyncio.to_thread(_semantic_cache.lookup, embedding, persons, text)
+            if cached is not None:
+                logger.debug(f"Semantic cache hit for chunk {req.chunk_id}")
+                return cached
 
     # Call OpenAI
-    prompt = _build_prompt(req)
+    prompt = _build_prompt(text, persons)
     try:
-        result = _call_openai(prompt)
+        result = await _call_openai(prompt)
     except Exception as e:
         logger.error(f"OpenAI API error for chunk {req.chunk_id}: {e}")
         # Graceful degradation: return safe default
-        return DetectResponse(
-            has_opinion=False,
-            targets=[],
-            opinion_spans=[],
-            polarity="unclear",
-            confidence=0.0,
-        )
+        return FAILED_RESULT
+
+    _check_result(req, text, result)
+
+    if embedding is not None:
+        _semantic_cache.put(embedding, persons, text, result)
+
+    return result
+
 
+def _truncated_text(req: DetectRequest) -> str:
+    """Return the request text, truncated to MAX_TEXT_LENGTH."""
+    text = req.text
+    if len(text) > MAX_TEXT_LENGTH:
+        text = text[:MAX_TEXT_LENGTH] + "..."
+        logger.warning(f"Truncated text for chunk {req.chunk_id} to {MAX_TEXT_LENGTH} chars")
+    return text
+
+
+def _check_result(req: DetectRequest, text: str, result: DetectResponse) -> None:
+    """Drop targets outside the persons list and log spans missing from text."""
     # Validate targets are from persons list
-    invalid_targets = [t for t in result.targets if t not in req.persons]
+    allowed = frozenset(req.persons)
+    invalid_targets = [t for t in result.targets if t not in allowed]
     if invalid_targets:
         logger.warning(f"Model returned invalid targets: {invalid_targets}")
-        result.targets = [t for t in result.targets if t in req.persons]
+        result.targets = [t for t in result.targets if t in allowed]
 
     # Validate spans are in text (log warning but don't fail)
-    for span in result.opinion_spans:
-        if span and span not in req.text:
-            logger.warning(f"Span not found in text: {span[:50]}...")
+    for span in _missing_spans(result.opinion_spans, text):
+        logger.warning(f"Span not found in text: {span[:50]}...")
 
-    return result
+
+async def _detect_group(items: list[DetectRequest]) -> list[DetectResponse]:
+    """Detect opinions for several chunks with one multi-chunk prompt.
+
+    Falls back to one prompt per chunk if the call fails or the model's
+    results don't match the input ids. Bypasses the response caches.
+    """
+    if len(items) == 1:
+        # A lone chunk takes the regular path, with its shorter prompt and caches
+        return [await _detect_single(items[0])]
+
+    texts = [_truncated_text(item) for item in items]
+    prompt = _build_batch_prompt([(t, tuple(item.persons)) for t, item in zip(texts, items)])
+    try:
+        text_out = await _complete(prompt, _BATCH_SYSTEM_MESSAGE, _BATCH_RESPONSE_FORMAT)
+        outputs = _batch_output_decoder.decode(text_out).results
+        # Exactly one result per input id; a duplicate would silently shadow another
+        ids = sorted(r.id for r in outputs)
+        if ids != list(range(len(items))):
+            raise ValueError(f"expected ids 0..{len(items) - 1}, got {ids}")
+        by_id = {r.id: r for r in outputs}
+    except Exception as e:
+        logger.warning(
+            f"Multi-chunk prompt failed for {len(items)} chunks, retrying one by one: {e}"
+        )
+        return list(await asyncio.gather(*(_detect_single(item) for item in items)))
+
+    results = []
+    for i, (item, text) in enumerate(zip(items, texts)):
+        fields = msgspec.structs.asdict(by_id[i])
+        del fields["id"]
+        result = DetectResponse.model_construct(**fields)
+        _check_result(item, text, result)
+        results.append(result)
+    return results
+
+
+async def _detect_grouped(items: list[DetectRequest]) -> list[DetectResponse]:
+    """Detect opinions packing BATCH_PROMPT_SIZE chunks with persons per prompt."""
+    results = [EMPTY_RESULT] * len(items)
+    pending = [i for i, item in enumerate(items) if item.persons]
+    groups = [
+        pending[i : i + BATCH_PROMPT_SIZE] for i in range(0, len(pending), BATCH_PROMPT_SIZE)
+    ]
+    group_results = await asyncio.gather(
+        *(_detect_group([items[i] for i in group]) for group in groups)
+    )
+    for group, group_result in zip(groups, group_results):
+        for i, result in zip(group, group_result):
+            results[i] = result
+    return results
+
+
+async def _batch_worker() -> None:
+    """Collect queued single-chunk requests and detect them in groups.
+
+    A group closes after BATCH_WAIT_MS or at BATCH_PROMPT_SIZE requests,
+    whichever comes first. Groups are resolved in their own tasks, so
+    collection continues while OpenAI answers.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        pending = [await _detect_queue.get()]
+        deadline = loop.time() + BATCH_WAIT_MS / 1000
+        try:
+            while len(pending) < BATCH_PROMPT_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(_detect_queue.get(), timeout))
+                except TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Shutting down: don't leave collected handlers waiting forever
+            _cancel_futures(pending)
+            raise
+        _spawn(_resolve_group(pending))
+
+
+def _cancel_futures(pending: list[tuple[DetectRequest, asyncio.Future]]) -> None:
+    """Cancel the handler futures of requests that will not be resolved."""
+    for _, future in pending:
+        future.cancel()
+
+
+async def _resolve_group(pending: list[tuple[DetectRequest, asyncio.Future]]) -> None:
+    """Detect a group of queued requests and hand each result to its handler."""
+    try:
+        results = await _detect_group([req for req, _ in pending])
+    except asyncio.CancelledError:
+        _cancel_futures(pending)
+        raise
+    except Exception as e:
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(e)
+        return
+    for (_, future), result in zip(pending, results):
+        if not future.done():
+            future.set_result(result)
+
+
+def _utc_now_iso() -> str:
+    """Return the current UTC time as a fixed-length ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _detection_row(req: DetectRequest, result: DetectResponse, created_at: str) -> tuple:
+    """Build a detection row in upsert_detection() argument order."""
+    return (
+        req.chunk_id,
+        req.start,
+        req.end,
+        pack_list(req.persons),
+        1 if result.has_opinion else 0,
+        pack_list(result.targets),
+        pack_list(result.opinion_spans),
+        result.polarity,
+        float(result.confidence),
+        created_at,
+    )
 
 
 def _persist_result(req: DetectRequest, result: DetectResponse) -> None:
     """Persist detection result to SQLite."""
-    now = datetime.now(timezone.utc).isoformat()
-    upsert_detection(
-        chunk_id=req.chunk_id,
-        start=req.start,
-        end=req.end,
-        persons_json=json.dumps(req.persons, ensure_ascii=False),
-        has_opinion=1 if result.has_opinion else 0,
-        targets_json=json.dumps(result.targets, ensure_ascii=False),
-        spans_json=json.dumps(result.opinion_spans, ensure_ascii=False),
-        polarity=result.polarity,
-        confidence=float(result.confidence),
-        created_at=now,
-    )
+    upsert_detection(*_detection_row(req, result, _utc_now_iso()))
 
 
 @app.post("/detect-opinion", response_model=DetectResponse)
-def detect_opinion(req: DetectRequest) -> DetectResponse:
+async def detect_opinion(req: DetectRequest) -> DetectResponse:
     """Detect opinion about persons in a single text chunk.
 
     Example:
@@ -214,23 +643,37 @@ def detect_opinion(req: DetectRequest) -> DetectResponse:
                 "persons": ["Иванов"]}
         Output: {"has_opinion": true, "targets": ["Иванов"], ...}
     """
-    result = _detect_single(req)
-    _persist_result(req, result)
+    if MICRO_BATCHING and req.persons:
+        future = asyncio.get_running_loop().create_future()
+        await _detect_queue.put((req, future))
+        result = await future
+    else:
+        result = await _detect_single(req)
+    await asyncio.to_thread(_persist_result, req, result)
     return result
 
 
 @app.post("/detect-opinion/batch", response_model=DetectBatchResponse)
-def detect_opinion_batch(req: DetectBatchRequest) -> DetectBatchResponse:
+async def detect_opinion_batch(req: DetectBatchRequest) -> DetectBatchResponse:
     """Detect opinions in multiple text chunks.
 
-    More efficient than calling /detect-opinion multiple times.
-    Results are persisted to SQLite for each chunk.
+    More efficient than calling /detect-opinion multiple times: chunks are
+    sent to OpenAI concurrently (bounded by OPENAI_CONCURRENCY), optionally
+    BATCH_PROMPT_SIZE chunks per prompt.
+    Results for all chunks are persisted to SQLite in a single transaction.
     """
-    results: list[DetectResponse] = []
-    for item in req.items:
-        result = _detect_single(item)
-        _persist_result(item, result)
-        results.append(result)
+    if BATCH_PROMPT_SIZE > 1:
+        results = await _detect_grouped(req.items)
+    else:
+        results = await asyncio.gather(*(_detect_single(item) for item in req.items))
+    # All rows in a batch share one timestamp
+    created_at = _utc_now_iso()
+    rows = [
+        _detection_row(item, result, created_at) for item, result in zip(req.items, results)
+    ]
+
+    # Persist the whole batch in one transaction
+    await asyncio.to_thread(upsert_detections_bulk, rows)
 
     total_with_opinions = sum(1 for r in results if r.has_opinion)
 
@@ -240,29 +683,149 @@ def detect_opinion_batch(req: DetectBatchRequest) -> DetectBatchResponse:
     )
 
 
+def _batch_api_line(chunk_id: str, prompt: str) -> bytes:
+    """Build one JSONL request line for the OpenAI Batch API."""
+    return orjson.dumps(
+        {
+            "custom_id": chunk_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": OPENAI_MODEL,
+                "messages": [_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+                "response_format": _RESPONSE_FORMAT,
+                "temperature": OPENAI_TEMPERATURE,
+            },
+        }
+    )
+
+
+def _parse_batch_output(item: dict, content: str | None) -> DetectResponse:
+    """Turn one Batch API completion into a checked DetectResponse."""
+    if content is None:
+        logger.error(f"No Batch API result for chunk {item['chunk_id']}")
+        return FAILED_RESULT
+    try:
+        parsed = _output_decoder.decode(content)
+    except msgspec.MsgspecError as e:
+        logger.error(f"Invalid Batch API result for chunk {item['chunk_id']}: {e}")
+        return FAILED_RESULT
+
+    result = DetectResponse.model_construct(**msgspec.structs.asdict(parsed))
+    _check_result(DetectRequest.model_construct(**item), item["text"], result)
+    return result
+
+
+@app.post("/detect-opinion/batch-async", response_model=BatchJobResponse)
+async def submit_opinion_batch(req: DetectBatchRequest) -> BatchJobResponse:
+    """Submit chunks to the OpenAI Batch API for offline detection.
+
+    Cheaper than /detect-opinion/batch and outside real-time rate limits, but
+    results arrive within 24h. Chunks without persons are stored right away;
+    poll GET /detect-opinion/batch-async/{batch_id} to ingest the rest.
+    """
+    created_at = _utc_now_iso()
+    empty = [item for item in req.items if not item.persons]
+    if empty:
+        rows = [_detection_row(item, EMPTY_RESULT, created_at) for item in empty]
+        await asyncio.to_thread(upsert_detections_bulk, rows)
+
+    # custom_id must be unique within a batch; the last item per chunk_id wins
+    pending = {item.chunk_id: item for item in req.items if item.persons}
+    if not pending:
+        return BatchJobResponse(batch_id=None, status="completed", stored=len(empty))
+
+    texts = {chunk_id: _truncated_text(item) for chunk_id, item in pending.items()}
+    jsonl = b"\n".join(
+        _batch_api_line(chunk_id, _build_prompt(texts[chunk_id], tuple(item.persons)))
+        for chunk_id, item in pending.items()
+    )
+    try:
+        input_file = await client.files.create(
+            file=("opinion-batch.jsonl", jsonl), purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+    except Exception as e:
+        logger.error(f"OpenAI Batch API submission failed: {e}")
+        raise HTTPException(status_code=502, detail=f"OpenAI Batch API error: {e}")
+
+    items = [
+        (chunk_id, item.start, item.end, pack_list(item.persons), texts[chunk_id])
+        for chunk_id, item in pending.items()
+    ]
+    await asyncio.to_thread(add_batch_items, batch.id, items)
+    logger.info(f"Submitted {len(items)} chunks as OpenAI batch {batch.id}")
+
+    return BatchJobResponse(batch_id=batch.id, status=batch.status, stored=len(empty))
+
+
+@app.get("/detect-opinion/batch-async/{batch_id}", response_model=BatchJobResponse)
+async def poll_opinion_batch(batch_id: str) -> BatchJobResponse:
+    """Check an OpenAI batch and, once it has finished, store its results.
+
+    Chunks without a usable result are stored as failed (confidence 0),
+    like OpenAI errors on the synchronous endpoints.
+    """
+    try:
+        batch = await client.batches.retrieve(batch_id)
+    except Exception as e:
+        logger.error(f"OpenAI Batch API lookup failed for {batch_id}: {e}")
+        raise HTTPException(status_code=502, detail=f"OpenAI Batch API error: {e}")
+
+    if batch.status not in BATCH_API_FINAL_STATUSES:
+        return BatchJobResponse(batch_id=batch_id, status=batch.status)
+
+    items = await asyncio.to_thread(get_batch_items, batch_id)
+    if not items:
+        # Already ingested (or never submitted from here)
+        return BatchJobResponse(batch_id=batch_id, status=batch.status)
+
+    outputs: dict[str, str] = {}
+    if batch.output_file_id:
+        output_file = await client.files.content(batch.output_file_id)
+        for line in output_file.content.splitlines():
+            if not line.strip():
+                continue
+            record = orjson.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                message = response["body"]["choices"][0]["message"]
+                outputs[record["custom_id"]] = message.get("content") or ""
+
+    created_at = _utc_now_iso()
+    rows = [
+        _detection_row(
+            DetectRequest.model_construct(**item),
+            _parse_batch_output(item, outputs.get(item["chunk_id"])),
+            created_at,
+        )
+        for item in items
+    ]
+    await asyncio.to_thread(complete_batch, batch_id, rows)
+
+    return BatchJobResponse(batch_id=batch_id, status=batch.status, stored=len(rows))
+
+
 @app.get("/chunks/{chunk_id}", response_model=ChunkResponse)
 def read_chunk(chunk_id: str) -> ChunkResponse:
-    """Retrieve stored detection result by chunk_id."""
+    """Retrieve stored detection result by chunk_id.
+
+    Kept sync: a cache miss reads SQLite, so FastAPI runs it on the threadpool.
+    """
     row = get_detection(chunk_id)
     if not row:
         raise HTTPException(status_code=404, detail=f"Chunk not found: {chunk_id}")
 
-    return ChunkResponse(
-        chunk_id=row["chunk_id"],
-        start=row["start"],
-        end=row["end"],
-        persons=json.loads(row["persons_json"]),
-        has_opinion=row["has_opinion"],
-        targets=json.loads(row["targets_json"]),
-        opinion_spans=json.loads(row["spans_json"]),
-        polarity=row["polarity"],
-        confidence=row["confidence"],
-        created_at=row["created_at"],
-    )
+    # Rows were validated on write; FastAPI still checks the response model
+    return ChunkResponse.model_construct(**row)
 
 
 @app.get("/healthz", response_model=HealthResponse)
-def healthz() -> HealthResponse:
+async def healthz() -> HealthResponse:
     """Health check endpoint for Docker orchestration."""
     return HealthResponse(
         status="healthy",
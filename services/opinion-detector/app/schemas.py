@@ -1,7 +1,8 @@
 """Pydantic models for Opinion Detector Service."""
 
-from typing import Literal
+from typing import Annotated, Literal
 
+import msgspec
 from pydantic import BaseModel, Field
 
 Polarity = Literal["negative", "positive", "mixed", "unclear"]
@@ -27,6 +28,28 @@ class DetectResponse(BaseModel):
     confidence: float = Field(..., ge=0, le=1, description="Confidence score")
 
 
+class DetectOutput(msgspec.Struct):
+    """msgspec mirror of DetectResponse for decoding raw model output."""
+
+    has_opinion: bool
+    targets: list[str]
+    opinion_spans: list[str]
+    polarity: Polarity
+    confidence: Annotated[float, msgspec.Meta(ge=0, le=1)]
+
+
+class DetectItemOutput(DetectOutput):
+    """One result of a multi-chunk prompt, tagged with its input item id."""
+
+    id: int
+
+
+class DetectBatchOutput(msgspec.Struct):
+    """Raw model output for a multi-chunk prompt."""
+
+    results: list[DetectItemOutput]
+
+
 class DetectBatchRequest(BaseModel):
     """Request model for batch opinion detection."""
 
@@ -40,6 +63,14 @@ class DetectBatchResponse(BaseModel):
     total_with_opinions: int = Field(description="Count of chunks with opinions")
 
 
+class BatchJobResponse(BaseModel):
+    """Response model for OpenAI Batch API submission and polling."""
+
+    batch_id: str | None = Field(description="OpenAI batch id (None if nothing was submitted)")
+    status: str = Field(description="OpenAI batch status, e.g. validating, in_progress, completed")
+    stored: int = Field(0, description="Detections written to SQLite by this call")
+
+
 class ChunkResponse(BaseModel):
     """Response model for stored chunk retrieval."""
 
@@ -0,0 +1,57 @@
+"""Shared test setup: app.main reads its configuration at import time."""
+
+import asyncio
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault(
+    "OPINION_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="opinion-tests-"), "opinions.db")
+)
+
+
+def completion(content: str) -> SimpleNamespace:
+    """Minimal stand-in for an OpenAI chat completion."""
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+class FakeChat:
+    """Records chat.completions.create calls and answers them with `respond`.
+
+    `respond(payload)` gets the decoded user message: {"input": {...}} for a
+    single chunk or {"items": [...]} for a multi-chunk prompt. It returns the
+    raw message content, or raises to simulate an API error.
+    """
+
+    def __init__(self, respond) -> None:
+        self.respond = respond
+        self.calls: list[dict] = []
+
+    async def create(self, **kwargs) -> SimpleNamespace:
+        payload = json.loads(kwargs["messages"][1]["content"])
+        self.calls.append(payload)
+        return completion(self.respond(payload))
+
+
+@pytest.fixture
+def main(monkeypatch):
+    """app.main with a fresh database and semaphore for each test."""
+    from app import db
+    from app import main as main_module
+
+    db.init_db()
+    monkeypatch.setattr(main_module, "_openai_semaphore", asyncio.Semaphore(4))
+    return main_module
+
+
+@pytest.fixture
+def fake_chat(main, monkeypatch):
+    """Install a FakeChat as the OpenAI client; set .respond in the test."""
+    chat = FakeChat(lambda payload: "")
+    monkeypatch.setattr(main.client.chat.completions, "create", chat.create)
+    return chat
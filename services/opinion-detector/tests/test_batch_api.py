@@ -0,0 +1,152 @@
+"""Tests for the OpenAI Batch API endpoints (/detect-opinion/batch-async)."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from app.db import get_detection
+from app.schemas import DetectBatchRequest, DetectRequest
+
+TEXT = "Вот такое стремление Иванова к миру."
+SPAN = "стремление Иванова"
+
+
+class FakeBatchApi:
+    """Stand-in for client.files and client.batches.
+
+    Captures the uploaded JSONL; `status` and `output` control what the
+    next retrieve()/content() calls return.
+    """
+
+    def __init__(self, batch_id: str) -> None:
+        self.batch_id = batch_id
+        self.status = "validating"
+        self.output: list[dict] = []
+        self.uploaded: bytes | None = None
+        self.content_calls = 0
+
+    async def files_create(self, *, file, purpose):
+        assert purpose == "batch"
+        self.uploaded = file[1]
+        return SimpleNamespace(id="file-in")
+
+    async def batches_create(self, *, input_file_id, endpoint, completion_window):
+        assert (input_file_id, endpoint) == ("file-in", "/v1/chat/completions")
+        return SimpleNamespace(id=self.batch_id, status=self.status)
+
+    async def batches_retrieve(self, batch_id):
+        assert batch_id == self.batch_id
+        output_file_id = "file-out" if self.status == "completed" else None
+        return SimpleNamespace(id=batch_id, status=self.status, output_file_id=output_file_id)
+
+    async def files_content(self, file_id):
+        assert file_id == "file-out"
+        self.content_calls += 1
+        return SimpleNamespace(content=b"\n".join(orjson.dumps(line) for line in self.output))
+
+
+@pytest.fixture
+def batch_api(main, monkeypatch, request):
+    api = FakeBatchApi(f"batch-{request.node.name}")
+    monkeypatch.setattr(main.client.files, "create", api.files_create)
+    monkeypatch.setattr(main.client.files, "content", api.files_content)
+    monkeypatch.setattr(main.client.batches, "create", api.batches_create)
+    monkeypatch.setattr(main.client.batches, "retrieve", api.batches_retrieve)
+    return api
+
+
+def _item(chunk_id: str, persons: list[str]) -> DetectRequest:
+    return DetectRequest(chunk_id=chunk_id, start=0, end=1, text=TEXT, persons=persons)
+
+
+def _success(chunk_id: str, detection: dict) -> dict:
+    message = {"role": "assistant", "content": json.dumps(detection)}
+    return {
+        "custom_id": chunk_id,
+        "response": {"status_code": 200, "body": {"choices": [{"message": message}]}},
+        "error": None,
+    }
+
+
+def test_submit_builds_one_request_line_per_chunk(main, batch_api):
+    req = DetectBatchRequest(
+        items=[
+            _item("bapi-jsonl-a", ["Иванов"]),
+            _item("bapi-jsonl-b", []),
+            _item("bapi-jsonl-c", ["Петров"]),
+        ]
+    )
+
+    job = asyncio.run(main.submit_opinion_batch(req))
+
+    assert (job.batch_id, job.status, job.stored) == (batch_api.batch_id, "validating", 1)
+    lines = [orjson.loads(line) for line in batch_api.uploaded.splitlines()]
+    assert [line["custom_id"] for line in lines] == ["bapi-jsonl-a", "bapi-jsonl-c"]
+    for line, persons in zip(lines, (["Иванов"], ["Петров"])):
+        assert line["method"] == "POST"
+        assert line["url"] == "/v1/chat/completions"
+        body = line["body"]
+        assert body["model"] == main.OPENAI_MODEL
+        assert body["temperature"] == main.OPENAI_TEMPERATURE
+        assert body["response_format"] == main._RESPONSE_FORMAT
+        assert body["messages"][0] == main._SYSTEM_MESSAGE
+        user = json.loads(body["messages"][1]["content"])
+        assert user["input"]["persons"] == persons
+        assert user["input"]["text"] == TEXT
+    # The chunk without persons is stored right away
+    assert get_detection("bapi-jsonl-b")["has_opinion"] is False
+
+
+def test_poll_stores_results_once(main, batch_api):
+    req = DetectBatchRequest(
+        items=[
+            _item("bapi-poll-ok", ["Иванов"]),
+            _item("bapi-poll-err", ["Иванов"]),
+            _item("bapi-poll-bad-target", ["Иванов"]),
+            _item("bapi-poll-missing", ["Иванов"]),
+        ]
+    )
+    asyncio.run(main.submit_opinion_batch(req))
+
+    job = asyncio.run(main.poll_opinion_batch(batch_api.batch_id))
+    assert (job.status, job.stored) == ("validating", 0)
+    assert batch_api.content_calls == 0
+
+    detection = {
+        "has_opinion": True,
+        "targets": ["Иванов"],
+        "opinion_spans": [SPAN],
+        "polarity": "negative",
+        "confidence": 0.9,
+    }
+    batch_api.status = "completed"
+    batch_api.output = [
+        _success("bapi-poll-ok", detection),
+        {
+            "custom_id": "bapi-poll-err",
+            "response": {"status_code": 500, "body": {"error": {"message": "server error"}}},
+            "error": None,
+        },
+        _success("bapi-poll-bad-target", {**detection, "targets": ["Петров"]}),
+    ]
+
+    job = asyncio.run(main.poll_opinion_batch(batch_api.batch_id))
+
+    assert (job.status, job.stored) == ("completed", 4)
+    ok = get_detection("bapi-poll-ok")
+    assert (ok["has_opinion"], ok["targets"], ok["opinion_spans"]) == (True, ["Иванов"], [SPAN])
+    # The errored line and the chunk absent from the output are stored as failed
+    for chunk_id in ("bapi-poll-err", "bapi-poll-missing"):
+        failed = get_detection(chunk_id)
+        assert (failed["has_opinion"], failed["confidence"]) == (False, 0.0)
+    # A target outside the chunk's persons is dropped
+    assert get_detection("bapi-poll-bad-target")["targets"] == []
+
+    # Second poll: nothing pending, output not downloaded again
+    job = asyncio.run(main.poll_opinion_batch(batch_api.batch_id))
+    assert (job.status, job.stored) == ("completed", 0)
+    assert batch_api.content_calls == 1
+    assert get_detection("bapi-poll-ok")["targets"] == ["Иванов"]
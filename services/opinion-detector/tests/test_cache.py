@@ -0,0 +1,121 @@
+"""Tests for the semantic response cache."""
+
+import math
+import threading
+
+from app.cache import SemanticResponseCache
+from app.schemas import DetectResponse
+
+
+def _response(*spans: str) -> DetectResponse:
+    return DetectResponse(
+        has_opinion=bool(spans),
+        targets=["Иванов"] if spans else [],
+        opinion_spans=list(spans),
+        polarity="negative" if spans else "unclear",
+        confidence=0.9,
+    )
+
+
+def _unit(angle: float) -> list[float]:
+    """2-d unit vector; the cosine between two of them is cos(angle difference)."""
+    return [math.cos(angle), math.sin(angle)]
+
+
+PERSONS = ("Иванов",)
+
+
+def test_hit_at_threshold_and_miss_below():
+    cache = SemanticResponseCache(threshold=0.9)
+    cached = _response()
+    cache.put(_unit(0.0), PERSONS, "text", cached)
+
+    at_threshold = math.acos(0.9) - 1e-9
+    below_threshold = math.acos(0.9) + 1e-3
+    assert cache.lookup(_unit(at_threshold), PERSONS, "new text") is cached
+    assert cache.lookup(_unit(below_threshold), PERSONS, "new text") is None
+
+
+def test_lookup_picks_most_similar_entry():
+    cache = SemanticResponseCache(threshold=0.5)
+    near, far = _response(), _response()
+    cache.put(_unit(0.3), PERSONS, "far", far)
+    cache.put(_unit(0.05), PERSONS, "near", near)
+
+    assert cache.lookup(_unit(0.0), PERSONS, "text") is near
+
+
+def test_hit_requires_spans_in_new_text():
+    cache = SemanticResponseCache(threshold=0.9)
+    cache.put(_unit(0.0), PERSONS, "Иванов провалил проект", _response("провалил проект"))
+
+    assert cache.lookup(_unit(0.0), PERSONS, "Иванов сорвал проект") is None
+    assert cache.lookup(_unit(0.0), PERSONS, "Иванов провалил проект.") is not None
+
+
+def test_entries_are_isolated_per_persons_tuple():
+    cache = SemanticResponseCache(threshold=0.9)
+    cache.put(_unit(0.0), ("Иванов",), "text", _response())
+
+    assert cache.lookup(_unit(0.0), ("Петров",), "text") is None
+    assert cache.lookup(_unit(0.0), ("Иванов", "Петров"), "text") is None
+    assert cache.lookup(_unit(0.0), ("Иванов",), "text") is not None
+
+
+def test_group_evicts_least_recently_used_at_capacity():
+    cache = SemanticResponseCache(threshold=0.99, max_entries_per_group=2)
+    first, second, third = _response(), _response(), _response()
+    cache.put(_unit(0.0), PERSONS, "first", first)
+    cache.put(_unit(1.0), PERSONS, "second", second)
+    # A hit refreshes "first", so "second" is the one evicted
+    assert cache.lookup(_unit(0.0), PERSONS, "text") is first
+    cache.put(_unit(2.0), PERSONS, "third", third)
+
+    assert cache.lookup(_unit(0.0), PERSONS, "text") is first
+    assert cache.lookup(_unit(1.0), PERSONS, "text") is None
+    assert cache.lookup(_unit(2.0), PERSONS, "text") is third
+
+
+def test_groups_evict_least_recently_used_at_capacity():
+    cache = SemanticResponseCache(threshold=0.99, max_groups=2)
+    cache.put(_unit(0.0), ("A",), "text", _response())
+    cache.put(_unit(0.0), ("B",), "text", _response())
+    cache.lookup(_unit(0.0), ("A",), "text")
+    cache.put(_unit(0.0), ("C",), "text", _response())
+
+    assert cache.lookup(_unit(0.0), ("A",), "text") is not None
+    assert cache.lookup(_unit(0.0), ("B",), "text") is None
+    assert cache.lookup(_unit(0.0), ("C",), "text") is not None
+
+
+def test_lookup_scans_snapshot_while_puts_continue():
+    cache = SemanticResponseCache(threshold=0.99, max_entries_per_group=64)
+    target = _response()
+    cache.put(_unit(0.0), PERSONS, "target", target)
+    stop = threading.Event()
+    errors: list[BaseException] = []
+
+    def writer() -> None:
+        i = 0
+        while not stop.is_set():
+            cache.put(_unit(1.0 + (i % 50) * 0.01), PERSONS, f"t{i % 50}", _response())
+            i += 1
+
+    def reader() -> None:
+        try:
+            for _ in range(2000):
+                # Must never raise "OrderedDict mutated during iteration"
+                cache.lookup(_unit(1.2), PERSONS, "text")
+        except BaseException as e:  # noqa: BLE001 - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for t in threads:
+        t.start()
+    threads[1].join()
+    stop.set()
+    threads[0].join()
+
+    assert errors == []
+    # The long-lived entry survives a full group of concurrent writes
+    assert cache.lookup(_unit(0.0), PERSONS, "text") is target
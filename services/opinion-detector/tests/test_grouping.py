@@ -0,0 +1,135 @@
+"""Tests for multi-chunk prompts (BATCH_PROMPT_SIZE > 1)."""
+
+import asyncio
+import json
+
+from app.schemas import DetectRequest
+
+TEXT = "Вот такое стремление Иванова к миру."
+SPAN = "стремление Иванова"
+
+
+def _item(i: int, persons: list[str] | None = None) -> DetectRequest:
+    return DetectRequest(
+        chunk_id=f"c{i}",
+        start=i,
+        end=i + 1,
+        text=TEXT,
+        persons=["Иванов"] if persons is None else persons,
+    )
+
+
+def _detection(targets: list[str], **extra) -> dict:
+    return {
+        "has_opinion": True,
+        "targets": targets,
+        "opinion_spans": [SPAN],
+        "polarity": "negative",
+        "confidence": 0.9,
+        **extra,
+    }
+
+
+def _group_sizes(calls: list[dict]) -> list[int]:
+    """Items per call: a multi-chunk prompt counts its items, a single prompt 1."""
+    return [len(payload["items"]) if "items" in payload else 1 for payload in calls]
+
+
+def test_group_results_are_matched_by_id(main, fake_chat):
+    # Answer out of order with per-item targets to show results follow ids
+    def respond(payload):
+        items = payload["items"]
+        results = [_detection(item["persons"], id=item["id"]) for item in reversed(items)]
+        return json.dumps({"results": results})
+
+    fake_chat.respond = respond
+    items = [_item(0, ["Иванов"]), _item(1, ["Петров"]), _item(2, ["Сидоров"])]
+
+    results = asyncio.run(main._detect_group(items))
+
+    assert _group_sizes(fake_chat.calls) == [3]
+    assert [r.targets for r in results] == [["Иванов"], ["Петров"], ["Сидоров"]]
+
+
+def test_invalid_targets_are_dropped_per_item(main, fake_chat):
+    def respond(payload):
+        # Every item claims both names; each only allows its own persons
+        results = [_detection(["Иванов", "Петров"], id=item["id"]) for item in payload["items"]]
+        return json.dumps({"results": results})
+
+    fake_chat.respond = respond
+    items = [_item(0, ["Иванов"]), _item(1, ["Петров"]), _item(2, ["Иванов", "Петров"])]
+
+    results = asyncio.run(main._detect_group(items))
+
+    assert [r.targets for r in results] == [["Иванов"], ["Петров"], ["Иванов", "Петров"]]
+
+
+def _falls_back_one_by_one(main, fake_chat, bad_results) -> None:
+    def respond(payload):
+        if "items" in payload:
+            return json.dumps({"results": bad_results(payload["items"])})
+        return json.dumps(_detection(["Иванов"]))
+
+    fake_chat.respond = respond
+    items = [_item(i) for i in range(3)]
+
+    results = asyncio.run(main._detect_group(items))
+
+    assert _group_sizes(fake_chat.calls) == [3, 1, 1, 1]
+    assert [r.targets for r in results] == [["Иванов"]] * 3
+
+
+def test_missing_id_falls_back_to_single_prompts(main, fake_chat):
+    _falls_back_one_by_one(
+        main, fake_chat, lambda items: [_detection([], id=item["id"]) for item in items[:-1]]
+    )
+
+
+def test_duplicate_id_falls_back_to_single_prompts(main, fake_chat):
+    # ids 0, 0, 1: a dict keyed by id would hide the duplicate and lose id 2
+    _falls_back_one_by_one(
+        main,
+        fake_chat,
+        lambda items: [_detection([], id=i) for i in (0, 0, 1)],
+    )
+
+
+def test_unknown_id_falls_back_to_single_prompts(main, fake_chat):
+    _falls_back_one_by_one(
+        main, fake_chat, lambda items: [_detection([], id=item["id"] + 1) for item in items]
+    )
+
+
+def test_invalid_json_falls_back_to_single_prompts(main, fake_chat):
+    def respond(payload):
+        if "items" in payload:
+            return "not json"
+        return json.dumps(_detection(["Иванов"]))
+
+    fake_chat.respond = respond
+
+    results = asyncio.run(main._detect_group([_item(0), _item(1)]))
+
+    assert _group_sizes(fake_chat.calls) == [2, 1, 1]
+    assert all(r.has_opinion for r in results)
+
+
+def test_grouped_skips_chunks_without_persons(main, fake_chat, monkeypatch):
+    monkeypatch.setattr(main, "BATCH_PROMPT_SIZE", 2)
+
+    def respond(payload):
+        if "items" in payload:
+            results = [_detection(["Иванов"], id=item["id"]) for item in payload["items"]]
+            return json.dumps({"results": results})
+        return json.dumps(_detection(["Иванов"]))
+
+    fake_chat.respond = respond
+    items = [_item(0), _item(1, []), _item(2), _item(3), _item(4, [])]
+
+    results = asyncio.run(main._detect_grouped(items))
+
+    # Chunks 0 and 2 share a prompt; chunk 3 is alone and takes the single path
+    assert _group_sizes(fake_chat.calls) == [2, 1]
+    assert [r.has_opinion for r in results] == [True, False, True, True, False]
+    assert results[1] is main.EMPTY_RESULT
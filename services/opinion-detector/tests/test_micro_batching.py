@@ -0,0 +1,152 @@
+"""Tests for micro-batching of /detect-opinion (BATCH_WAIT_MS > 0)."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.schemas import DetectRequest
+
+TEXT = "Вот такое стремление Иванова к миру."
+
+
+def _item(i: int) -> DetectRequest:
+    return DetectRequest(chunk_id=f"mb{i}", start=i, end=i + 1, text=TEXT, persons=["Иванов"])
+
+
+@pytest.fixture
+def batching(main, monkeypatch):
+    """Enable micro-batching with a fresh queue; each test runs its own loop."""
+    monkeypatch.setattr(main, "MICRO_BATCHING", True)
+    monkeypatch.setattr(main, "BATCH_PROMPT_SIZE", 8)
+    monkeypatch.setattr(main, "BATCH_WAIT_MS", 20.0)
+    monkeypatch.setattr(main, "_detect_queue", asyncio.Queue())
+    monkeypatch.setattr(main, "_background_tasks", set())
+    return main
+
+
+async def _enqueue(main, req: DetectRequest) -> asyncio.Future:
+    future = asyncio.get_running_loop().create_future()
+    await main._detect_queue.put((req, future))
+    return future
+
+
+def test_group_flushes_on_timeout(batching, fake_chat):
+    main = batching
+
+    def respond(payload):
+        results = [
+            {
+                "id": item["id"],
+                "has_opinion": True,
+                "targets": ["Иванов"],
+                "opinion_spans": [],
+                "polarity": "negative",
+                "confidence": 0.9,
+            }
+            for item in payload["items"]
+        ]
+        return json.dumps({"results": results})
+
+    fake_chat.respond = respond
+
+    async def run():
+        main._spawn(main._batch_worker())
+        try:
+            # Far below BATCH_PROMPT_SIZE, so only the deadline can close the group
+            results = await asyncio.wait_for(
+                asyncio.gather(*(main.detect_opinion(_item(i)) for i in range(3))), 1.0
+            )
+        finally:
+            await main._stop_background_tasks()
+        return results
+
+    results = asyncio.run(run())
+
+    assert [len(payload["items"]) for payload in fake_chat.calls] == [3]
+    assert all(r.has_opinion for r in results)
+
+
+def test_group_error_reaches_every_waiting_request(batching, monkeypatch):
+    main = batching
+    error = RuntimeError("detection failed")
+
+    async def failing_group(items):
+        raise error
+
+    monkeypatch.setattr(main, "_detect_group", failing_group)
+
+    async def run():
+        main._spawn(main._batch_worker())
+        try:
+            futures = [await _enqueue(main, _item(i)) for i in range(3)]
+            return await asyncio.wait_for(
+                asyncio.gather(*futures, return_exceptions=True), 1.0
+            )
+        finally:
+            await main._stop_background_tasks()
+
+    assert asyncio.run(run()) == [error] * 3
+
+
+def test_shutdown_cancels_worker_and_waiting_requests(batching, monkeypatch):
+    main = batching
+    monkeypatch.setattr(main, "BATCH_WAIT_MS", 60_000.0)
+
+    async def run():
+        worker = main._spawn(main._batch_worker())
+        future = await _enqueue(main, _item(0))
+        # Let the worker pick the request up and start waiting for more
+        await asyncio.sleep(0.01)
+
+        await main._stop_background_tasks()
+
+        assert worker.cancelled()
+        assert future.cancelled()
+        assert not main._background_tasks
+
+    asyncio.run(run())
+
+
+def test_shutdown_cancels_groups_in_flight(batching, monkeypatch):
+    main = batching
+    monkeypatch.setattr(main, "BATCH_WAIT_MS", 1.0)
+    started = None
+
+    async def slow_group(items):
+        started.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(main, "_detect_group", slow_group)
+
+    async def run():
+        nonlocal started
+        started = asyncio.Event()
+        main._spawn(main._batch_worker())
+        futures = [await _enqueue(main, _item(i)) for i in range(2)]
+        await asyncio.wait_for(started.wait(), 1.0)
+
+        await main._stop_background_tasks()
+
+        assert all(future.cancelled() for future in futures)
+        assert not main._background_tasks
+
+    asyncio.run(run())
+
+
+def test_lifespan_starts_and_stops_worker(batching, monkeypatch):
+    main = batching
+    closed = []
+
+    async def close():
+        closed.append(True)
+
+    monkeypatch.setattr(main.client, "close", close)
+
+    async def run():
+        async with main._lifespan(main.app):
+            assert len(main._background_tasks) == 1
+        assert not main._background_tasks
+
+    asyncio.run(run())
+    assert closed == [True]
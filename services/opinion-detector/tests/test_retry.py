@@ -0,0 +1,72 @@
+"""Tests for the OpenAI retry policy (src/openai_retry.py) as the service uses it."""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from openai_retry import is_transient, retry_after
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def _status_error(status: int, headers: dict | None = None) -> openai.APIStatusError:
+    response = httpx.Response(status, headers=headers, request=REQUEST)
+    cls = {400: openai.BadRequestError, 429: openai.RateLimitError}.get(
+        status, openai.InternalServerError if status >= 500 else openai.APIStatusError
+    )
+    return cls("error", response=response, body=None)
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (_status_error(429), True),
+        (_status_error(500), True),
+        (_status_error(503), True),
+        (openai.APITimeoutError(REQUEST), True),
+        (openai.APIConnectionError(request=REQUEST), True),
+        (_status_error(400), False),
+        (_status_error(404), False),
+        (ValueError("bad output"), False),
+    ],
+)
+def test_is_transient(exc, expected):
+    assert is_transient(exc) is expected
+
+
+def test_retry_after_headers():
+    assert retry_after(_status_error(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after(_status_error(429, {"retry-after": "3"})) == 3.0
+    assert retry_after(_status_error(429, {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) is None
+    assert retry_after(ValueError()) is None
+
+
+def _failing_chat(main, monkeypatch, errors: list[BaseException]) -> list[int]:
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(1)
+        raise errors[len(calls) - 1]
+
+    monkeypatch.setattr(main.client.chat.completions, "create", create)
+    return calls
+
+
+def test_client_errors_are_not_retried(main, monkeypatch):
+    calls = _failing_chat(main, monkeypatch, [_status_error(400)])
+
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(main._complete_with_retry("prompt"))
+    assert len(calls) == 1
+
+
+def test_server_errors_are_retried(main, monkeypatch):
+    # retry-after-ms: 0 keeps the test from sleeping
+    error = _status_error(500, {"retry-after-ms": "0"})
+    calls = _failing_chat(main, monkeypatch, [error] * 3)
+
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(main._complete_with_retry("prompt"))
+    assert len(calls) == 3
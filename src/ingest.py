@@ -10,26 +10,209 @@ Usage:
 Environment Variables:
     OPENAI_API_KEY: Required. Your OpenAI API key.
     QDRANT_URL: Qdrant server URL (default: http://localhost:6333)
+    QDRANT_PREFER_GRPC: Set to 1 to upsert over gRPC; the server must also
+        expose port 6334 on the QDRANT_URL host (default: 0, REST only)
     QDRANT_COLLECTION: Collection name (default: mentions_mvp)
     TRANSCRIPT_PATH: Path to transcript file (default: data/transcripts/sample.txt)
     VIDEO_URL: Optional video URL for metadata
+    EMBED_BATCH_SIZE: Max chunks per embeddings request (default: 256)
+    EMBED_MAX_TOKENS: Max total tokens per embeddings request (default: 100000)
+    EMBED_CONCURRENCY: Max concurrent embeddings requests (default: 8)
 """
 
+import asyncio
 import os
+import re
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import httpx
+import tiktoken
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings
-from langchain_qdrant import QdrantVectorStore
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from openai import AsyncOpenAI
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+from tenacity import AsyncRetrying, stop_after_attempt
+
+from openai_retry import retry_if_transient, wait_retry_after
 
 load_dotenv()
 
 # Configuration from environment
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 QDRANT_URL = os.environ.get("QDRANT_URL", "http://localhost:6333")
+# gRPC is faster for bulk upserts but needs port 6334 reachable next to QDRANT_URL
+QDRANT_PREFER_GRPC = os.environ.get("QDRANT_PREFER_GRPC", "0") == "1"
 COLLECTION = os.environ.get("QDRANT_COLLECTION", "mentions_mvp")
 TRANSCRIPT_PATH = os.environ.get("TRANSCRIPT_PATH", "data/transcripts/sample.txt")
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBED_BATCH_SIZE = int(os.environ.get("EMBED_BATCH_SIZE", "256"))
+# OpenAI allows up to 300k tokens (and 2048 inputs) per embeddings request
+EMBED_MAX_TOKENS = int(os.environ.get("EMBED_MAX_TOKENS", "100000"))
+EMBED_CONCURRENCY = int(os.environ.get("EMBED_CONCURRENCY", "8"))
+# Upper bound for a single retry wait, including server Retry-After hints
+MAX_RETRY_WAIT = 60.0
+
+# Durations in OpenAI x-ratelimit-reset-* headers, e.g. "1s", "6m0s", "120ms"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+# Points per Qdrant upsert request, and upsert requests in flight
+UPSERT_BATCH_SIZE = 256
+UPSERT_PARALLEL = 4
+
+
+def pack_by_tokens(
+    texts: list[str],
+    max_tokens: int,
+    max_items: int,
+    enc: tiktoken.Encoding,
+) -> Iterator[list[str]]:
+    """Greedily group texts into batches under both a token and an item budget.
+
+    A single text over max_tokens still gets a batch of its own.
+    """
+    batch: list[str] = []
+    batch_tokens = 0
+    for text, tokens in zip(texts, enc.encode_ordinary_batch(texts)):
+        n_tokens = len(tokens)
+        if batch and (batch_tokens + n_tokens > max_tokens or len(batch) >= max_items):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += n_tokens
+    if batch:
+        yield batch
+
+
+def _parse_duration(value: str) -> float:
+    """Convert an OpenAI rate-limit reset duration to seconds."""
+    return sum(float(n) * _DURATION_SECONDS[unit] for n, unit in _DURATION_PART.findall(value))
+
+
+def rate_limit_pause(headers) -> float:
+    """Seconds to hold off new requests, based on OpenAI rate-limit headers.
+
+    Pauses until the relevant window resets when fewer requests than
+    EMBED_CONCURRENCY or fewer tokens than one full batch remain.
+    """
+    pause = 0.0
+    remaining_requests = headers.get("x-ratelimit-remaining-requests")
+    if remaining_requests is not None and int(remaining_requests) < EMBED_CONCURRENCY:
+        pause = _parse_duration(headers.get("x-ratelimit-reset-requests", ""))
+    remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+    if remaining_tokens is not None and int(remaining_tokens) < EMBED_MAX_TOKENS:
+        pause = max(pause, _parse_duration(headers.get("x-ratelimit-reset-tokens", "")))
+    return pause
+
+
+async def embed_texts(texts: list[str]) -> list[list[float]]:
+    """Embed texts concurrently with as few embeddings requests as the budgets allow.
+
+    Up to EMBED_CONCURRENCY requests are in flight; all of them hold off
+    when the rate-limit headers say the budget is nearly spent.
+    """
+    enc = tiktoken.encoding_for_model(EMBEDDING_MODEL)
+    batches = list(pack_by_tokens(texts, EMBED_MAX_TOKENS, EMBED_BATCH_SIZE, enc))
+    if not batches:
+        return []
+    semaphore = asyncio.Semaphore(EMBED_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+    resume_at = 0.0
+
+    async def embed_batch(client: AsyncOpenAI, batch: list[str]) -> list[list[float]]:
+        nonlocal resume_at
+        async with semaphore:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(5),
+                retry=retry_if_transient,
+                wait=wait_retry_after(MAX_RETRY_WAIT),
+                reraise=True,
+            ):
+                with attempt:
+                    delay = resume_at - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    raw = await client.embeddings.with_raw_response.create(
+                        model=EMBEDDING_MODEL, input=batch
+                    )
+            pause = rate_limit_pause(raw.headers)
+            if pause:
+                resume_at = max(resume_at, loop.time() + pause)
+            return [item.embedding for item in raw.parse().data]
+
+    # Created after tokenizing, so a tiktoken failure leaves nothing open, and
+    # closed even if a request fails. tenacity owns retries so attempts aren't
+    # multiplied by the client's own; HTTP/2 multiplexes the concurrent
+    # requests over a few kept-alive connections.
+    async with AsyncOpenAI(
+        api_key=OPENAI_API_KEY,
+        max_retries=0,
+        http_client=httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=EMBED_CONCURRENCY,
+                max_keepalive_connections=EMBED_CONCURRENCY,
+            ),
+            timeout=httpx.Timeout(60.0, connect=5.0),
+        ),
+    ) as client:
+        results = await asyncio.gather(*(embed_batch(client, batch) for batch in batches))
+    return [vector for batch_vectors in results for vector in batch_vectors]
+
+
+def store_vectors(
+    texts: list[str],
+    vectors: list[list[float]],
+    base_metadata: dict,
+) -> None:
+    """Upsert precomputed vectors into Qdrant, creating the collection if needed.
+
+    Each point's metadata is base_metadata plus its chunk_id (the index in
+    texts), built only as the point is. Payloads use the layout of
+    langchain_qdrant.QdrantVectorStore ("page_content" and "metadata"),
+    so query.py can read them back.
+    """
+    if not vectors:
+        return
+
+    # With QDRANT_PREFER_GRPC, upserts stream over one persistent HTTP/2 channel
+    client = QdrantClient(url=QDRANT_URL, prefer_grpc=QDRANT_PREFER_GRPC, timeout=60)
+    try:
+        if not client.collection_exists(COLLECTION):
+            client.create_collection(
+                collection_name=COLLECTION,
+                vectors_config=VectorParams(size=len(vectors[0]), distance=Distance.COSINE),
+            )
+
+        points = [
+            PointStruct(
+                id=uuid.uuid4().hex,
+                vector=vector,
+                payload={"page_content": text, "metadata": {**base_metadata, "chunk_id": i}},
+            )
+            for i, (text, vector) in enumerate(zip(texts, vectors))
+        ]
+        batches = [
+            points[i : i + UPSERT_BATCH_SIZE] for i in range(0, len(points), UPSERT_BATCH_SIZE)
+        ]
+        # wait=False: Qdrant acknowledges once a batch is in its WAL and applies it later
+        with ThreadPoolExecutor(max_workers=UPSERT_PARALLEL) as pool:
+            list(
+                pool.map(
+                    lambda batch: client.upsert(
+                        collection_name=COLLECTION, points=batch, wait=False
+                    ),
+                    batches[:-1],
+                )
+            )
+        # Updates are applied in WAL order, so waiting on the last batch means
+        # every point is searchable when this returns
+        client.upsert(collection_name=COLLECTION, points=batches[-1], wait=True)
+    finally:
+        client.close()
 
 
 def main() -> None:
@@ -53,38 +236,30 @@ def main() -> None:
         chunk_size=800,
         chunk_overlap=120,
     )
-    docs = splitter.create_documents([raw_text])
-    print(f"  Chunks created: {len(docs)}")
+    texts = splitter.split_text(raw_text)
+    print(f"  Chunks created: {len(texts)}")
 
-    # Attach metadata to each chunk
+    # Metadata shared by every chunk; store_vectors adds each chunk_id
     video_url = os.environ.get("VIDEO_URL", "https://youtube.com/watch?v=VIDEO_ID")
-    for i, doc in enumerate(docs):
-        doc.metadata.update(
-            {
-                "source_file": str(path),
-                "chunk_id": i,
-                "video_url": video_url,
-                # Placeholders for timestamps (to be implemented in later phases)
-                "start_sec": None,
-                "end_sec": None,
-            }
-        )
+    base_metadata = {
+        "source_file": str(path),
+        "video_url": video_url,
+        # Placeholders for timestamps (to be implemented in later phases)
+        "start_sec": None,
+        "end_sec": None,
+    }
 
-    # Create embeddings and store in Qdrant
+    # Embed all chunks up front, packing each API request up to the token budget
+    # and sending up to EMBED_CONCURRENCY requests at once
     print(f"Generating embeddings with OpenAI...")
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+    vectors = asyncio.run(embed_texts(texts))
 
     print(f"Storing in Qdrant collection: {COLLECTION}")
     print(f"  Qdrant URL: {QDRANT_URL}")
 
-    QdrantVectorStore.from_documents(
-        documents=docs,
-        embedding=embeddings,
-        url=QDRANT_URL,
-        collection_name=COLLECTION,
-    )
+    store_vectors(texts, vectors, base_metadata)
 
-    print(f"Ingested {len(docs)} chunks into Qdrant collection: {COLLECTION}")
+    print(f"Ingested {len(texts)} chunks into Qdrant collection: {COLLECTION}")
 
 
 if __name__ == "__main__":
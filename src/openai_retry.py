@@ -0,0 +1,61 @@
+"""Retry policy for OpenAI API calls, shared by ingest.py and the opinion-detector service.
+
+Only transient failures are retried: rate limits, timeouts, connection errors
+and 5xx responses. Waits honor the server's Retry-After hint when there is
+one and back off exponentially otherwise; either way a single wait is capped
+by the caller's max_wait.
+
+Usage:
+    retry(retry=retry_if_transient, wait=wait_retry_after(max_wait=10.0), ...)
+
+The opinion-detector image copies this file next to its app package (see
+services/opinion-detector/Dockerfile), so keep it free of imports from src/.
+"""
+
+from collections.abc import Callable
+
+from openai import APIConnectionError, APIStatusError, RateLimitError
+from tenacity import RetryCallState, retry_if_exception, wait_exponential
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether an OpenAI error is worth retrying.
+
+    APITimeoutError is a subclass of APIConnectionError. Other 4xx errors
+    (bad request, auth, not found) would fail the same way again.
+    """
+    if isinstance(exc, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(exc, APIStatusError) and exc.status_code >= 500
+
+
+retry_if_transient = retry_if_exception(is_transient)
+
+
+def retry_after(exc: BaseException | None) -> float | None:
+    """Seconds the server asked us to wait (Retry-After headers), if any."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # e.g. an HTTP date; fall back to exponential backoff
+    return None
+
+
+def wait_retry_after(max_wait: float) -> Callable[[RetryCallState], float]:
+    """Tenacity wait: honor Retry-After, else back off exponentially, capped at max_wait."""
+    backoff = wait_exponential(multiplier=1, min=1, max=max_wait)
+
+    def wait(retry_state: RetryCallState) -> float:
+        hint = retry_after(retry_state.outcome.exception())
+        if hint is not None:
+            return min(max(hint, 0.0), max_wait)
+        return backoff(retry_state)
+
+    return wait
@@ -20,13 +20,21 @@ Environment Variables:
     QDRANT_COLLECTION: Collection name (default: mentions_mvp)
     QUERY: Default query if not provided as argument
     TOP_K: Number of results to return (default: 3)
+    QUERY_EMBED_CACHE: SQLite file caching query embeddings
+        (default: ~/.cache/media_rag/query_embeddings.db, empty disables).
+        Never evicted; delete the file to reclaim space.
 """
 
 import argparse
+import hashlib
 import os
+import sqlite3
 import sys
+from array import array
+from pathlib import Path
 
 from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import QdrantVectorStore
 
@@ -36,11 +44,59 @@ load_dotenv()
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 QDRANT_URL = os.environ.get("QDRANT_URL", "http://localhost:6333")
 COLLECTION = os.environ.get("QDRANT_COLLECTION", "mentions_mvp")
+EMBEDDING_MODEL = "text-embedding-3-small"
+QUERY_EMBED_CACHE = os.environ.get(
+    "QUERY_EMBED_CACHE", str(Path.home() / ".cache" / "media_rag" / "query_embeddings.db")
+)
 
 # Default query uses real names from sample transcript
 DEFAULT_QUERY = "What is Michael Harris's approach to leadership?"
 
 
+class CachedQueryEmbeddings(Embeddings):
+    """Embeddings wrapper that keeps query vectors in an on-disk SQLite cache.
+
+    Keys are SHA-256 of model and query text, so repeated queries skip the
+    OpenAI round trip. Document embedding is passed through uncached.
+    There is no eviction: the table grows by one row (~12 KB) per distinct
+    query until the file is deleted. Call close() when done.
+    """
+
+    def __init__(self, inner: Embeddings, model: str, path: str) -> None:
+        self.inner = inner
+        self.model = model
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_embedding (hash TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed documents with the wrapped model (not cached)."""
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a query, reading and filling the SQLite cache."""
+        key = hashlib.sha256(f"{self.model}\0{text}".encode()).hexdigest()
+        row = self.conn.execute(
+            "SELECT vector FROM query_embedding WHERE hash = ?", (key,)
+        ).fetchone()
+        if row:
+            return array("d", row[0]).tolist()
+
+        vector = self.inner.embed_query(text)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO query_embedding (hash, vector) VALUES (?, ?)",
+                (key, array("d", vector).tobytes()),
+            )
+        return vector
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        self.conn.close()
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -98,22 +154,32 @@ def main() -> int:
         return 1
 
     # Connect to embeddings and Qdrant
-    embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+    embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+    cache = None
+    if QUERY_EMBED_CACHE:
+        cache = embeddings = CachedQueryEmbeddings(embeddings, EMBEDDING_MODEL, QUERY_EMBED_CACHE)
 
     try:
-        store = QdrantVectorStore.from_existing_collection(
-            embedding=embeddings,
-            url=QDRANT_URL,
-            collection_name=args.collection,
-        )
-    except Exception as e:
-        print(f"Error connecting to Qdrant: {e}", file=sys.stderr)
-        print(f"Make sure Qdrant is running at {QDRANT_URL}", file=sys.stderr)
-        print(f"and collection '{args.collection}' exists.", file=sys.stderr)
-        return 1
-
-    # Perform similarity search
-    results = store.similarity_search_with_score(args.query, k=args.top_k)
+        try:
+            store = QdrantVectorStore.from_existing_collection(
+                embedding=embeddings,
+                url=QDRANT_URL,
+                collection_name=args.collection,
+            )
+        except Exception as e:
+            print(f"Error connecting to Qdrant: {e}", file=sys.stderr)
+            print(f"Make sure Qdrant is running at {QDRANT_URL}", file=sys.stderr)
+            print(f"and collection '{args.collection}' exists.", file=sys.stderr)
+            return 1
+
+        # Embed once, then search by vector so further searches can reuse it
+        query_vector = embeddings.embed_query(args.query)
+    finally:
+        # The cache is only needed for the query embedding
+        if cache is not None:
+            cache.close()
+
+    results = store.similarity_search_with_score_by_vector(query_vector, k=args.top_k)
 
     # Display results
     print(f"\nQuery: {args.query}")
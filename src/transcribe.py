@@ -14,6 +14,13 @@ Usage:
     uv run python src/transcribe.py --audio-file path/to/audio.mp3
     uv run python src/transcribe.py -a path/to/audio.mp3 --language en
 
+    # Many local files concurrently (directory or glob)
+    uv run python src/transcribe.py --batch path/to/audio_dir
+    uv run python src/transcribe.py --batch "recordings/*.wav" --concurrency 4
+
+    # Many YouTube videos (one URL per line), downloading while transcribing
+    uv run python src/transcribe.py --urls playlist.txt
+
 Environment Variables:
     DEEPGRAM_API_KEY: Required. Your Deepgram API key.
 
@@ -22,46 +29,83 @@ Requirements:
 """
 
 import argparse
+import asyncio
+import atexit
+import functools
+import glob
+import hashlib
 import json
+import operator
 import os
+import queue
 import re
+import shutil
+import string
 import sys
+import tempfile
+import threading
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 
 import httpx
 import yt_dlp
-from deepgram import DeepgramClient
+from deepgram import AsyncDeepgramClient, DeepgramClient
 from deepgram_captions import DeepgramConverter, srt
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with langsmith, but stay optional
+    orjson = None
+
 load_dotenv()
 
 # Configuration
 DEEPGRAM_API_KEY = os.environ.get("DEEPGRAM_API_KEY")
 DEFAULT_OUTPUT_DIR = "data/transcripts"
 DEFAULT_LANGUAGE = "ru"
+# Read size for streaming audio uploads
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# aria2c fetches YouTube audio over parallel range requests when it is installed
+ARIA2C_ARGS = ["-x", "16", "-s", "16", "-k", "1M", "--file-allocation=none"]
+# Raw Deepgram responses are memoized here, under the output directory
+CACHE_DIR_NAME = ".cache"
+# Downloaded files waiting for a transcription worker in --urls mode;
+# downloads pause when it is full so they don't run far ahead of Deepgram
+PIPELINE_QUEUE_SIZE = 2
+# Files picked up from a --batch directory
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".ogg", ".flac", ".webm")
+
+
+# Characters of an 11-character YouTube video ID
+_VIDEO_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+# YouTube URL (group 1) or just the ID (group 2)
+_VIDEO_ID_RE = re.compile(
+    r"(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})"
+    r"|^([a-zA-Z0-9_-]{11})$"
+)
 
 
 def extract_video_id(url: str) -> str | None:
     """Extract YouTube video ID from various URL formats."""
-    patterns = [
-        r"(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})",
-        r"^([a-zA-Z0-9_-]{11})$",  # Just the ID
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    # Bare IDs (e.g. from a --urls list) need no regex
+    if len(url) == 11 and _VIDEO_ID_CHARS.issuperset(url):
+        return url
+    match = _VIDEO_ID_RE.search(url)
+    if match:
+        return match.group(1) or match.group(2)
     return None
 
 
-def download_audio(url: str, output_dir: Path) -> Path:
+def download_audio(url: str, output_dir: Path, quiet: bool = False) -> Path:
     """Download audio from YouTube video.
 
     Args:
         url: YouTube video URL
         output_dir: Directory to save the audio file
+        quiet: Suppress progress output (for parallel downloads)
 
     Returns:
         Path to the downloaded audio file
@@ -72,38 +116,190 @@ def download_audio(url: str, output_dir: Path) -> Path:
 
     output_template = str(output_dir / f"{video_id}.%(ext)s")
 
+    # Keep the native stream (usually Opus in WebM): Deepgram decodes it directly,
+    # so there is no ffmpeg re-encode and the upload is smaller than a 192k MP3
     ydl_opts = {
-        "format": "bestaudio/best",
+        "format": "bestaudio[ext=webm]/bestaudio/best",
         "outtmpl": output_template,
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "192",
-            }
-        ],
-        "quiet": False,
+        "quiet": quiet,
+        "noprogress": quiet,
         "no_warnings": False,
     }
+    if shutil.which("aria2c"):
+        # YouTube throttles single connections; many ranged ones are several times faster
+        ydl_opts["external_downloader"] = {"default": "aria2c"}
+        ydl_opts["external_downloader_args"] = {"aria2c": ARIA2C_ARGS}
 
-    print(f"Downloading audio from: {url}")
+    if not quiet:
+        print(f"Downloading audio from: {url}")
     with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        ydl.download([url])
+        info = ydl.extract_info(url, download=True)
+        audio_path = Path(ydl.prepare_filename(info))
 
-    audio_path = output_dir / f"{video_id}.mp3"
     if not audio_path.exists():
         raise FileNotFoundError(f"Audio file not created: {audio_path}")
 
-    print(f"Audio saved: {audio_path}")
+    if not quiet:
+        print(f"Audio saved: {audio_path}")
     return audio_path
 
 
+def iter_file_chunks(path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's contents in chunks so uploads never hold the whole file."""
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+async def aiter_file_chunks(
+    path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Async variant of iter_file_chunks; reads run in a worker thread."""
+    with open(path, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+
+
+def transcription_options(language: str, diarize: bool, filler_words: bool) -> dict:
+    """Deepgram v1 transcription options shared by sync and async calls."""
+    return {
+        "model": "nova-3",
+        "language": language,
+        "smart_format": True,
+        "punctuate": True,
+        "paragraphs": True,
+        "utterances": True,  # Required for SRT generation
+        "filler_words": filler_words,
+        "diarize": diarize,
+    }
+
+
+def response_to_dict(response) -> dict:
+    """Convert a Deepgram SDK response to a dict across SDK versions.
+
+    Object-to-dict conversions are tried before to_json(), which would
+    serialize the whole (often multi-MB) response only to parse it again.
+    """
+    if hasattr(response, "model_dump"):
+        # SDK v5 (pydantic): JSON-safe values under the API's field names, no
+        # JSON round trip. A fresh response then matches its reloaded cache entry.
+        return response.model_dump(mode="json", by_alias=True)
+    elif hasattr(response, "to_dict"):
+        return response.to_dict()
+    elif hasattr(response, "result"):
+        # v1 API might wrap result
+        return response_to_dict(response.result)
+    elif hasattr(response, "to_json"):
+        return load_json(response.to_json())
+    # Fallback: try to access as dict-like or use __dict__
+    try:
+        return dict(response)
+    except (TypeError, ValueError):
+        return response.__dict__
+
+
+def json_serializer(obj):
+    """JSON default for datetime objects in Deepgram responses."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dump_json(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, with orjson when it is available."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option, default=json_serializer)
+    return json.dumps(
+        obj, ensure_ascii=False, indent=2 if indent else None, default=json_serializer
+    ).encode("utf-8")
+
+
+def load_json(data: str | bytes):
+    """Parse JSON text or bytes, with orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temp file and rename, so it is never left half-written.
+
+    The temp name is unique, so concurrent writers to the same path don't
+    share one, and it is removed if writing fails. No fsync: every output
+    can be regenerated, only a torn file is harmful.
+    """
+    tmp = tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+    )
+    try:
+        with tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+
+
+def response_cache_path(output_dir: Path, source: str | Path, options: dict) -> Path:
+    """Path of the memoized response for a source transcribed with given options.
+
+    source is a YouTube video ID, or a local audio file. Local files are keyed
+    by resolved path, size and mtime, so a re-recorded file or two files with
+    the same stem in different directories never share a response.
+    """
+    if isinstance(source, Path):
+        stat = source.stat()
+        source_key = f"{source.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+    else:
+        source_key = source
+    key_source = "|".join(
+        [source_key, options["model"], options["language"], str(options["diarize"]), str(options["filler_words"])]
+    )
+    key = hashlib.blake2b(key_source.encode()).hexdigest()[:16]
+    return output_dir / CACHE_DIR_NAME / f"{key}.json"
+
+
+def load_cached_response(path: Path) -> dict | None:
+    """Return a memoized Deepgram response, or None if there is none."""
+    if not path.exists():
+        return None
+    return load_json(path.read_bytes())
+
+
+def store_cached_response(path: Path, response: dict) -> None:
+    """Memoize a Deepgram response."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, dump_json(response))
+
+
+@functools.lru_cache(maxsize=1)
+def deepgram_client(timeout: int) -> DeepgramClient:
+    """Shared Deepgram client over one kept-alive HTTP/2 connection pool.
+
+    Repeated transcriptions in the same process reuse the TCP/TLS connection
+    instead of paying a new handshake each time. The --urls pipeline calls it
+    from several transcription threads at once; that is safe because
+    httpx.Client is thread-safe (its connection pool guards shared state with
+    locks) and DeepgramClient keeps no per-request state of its own. The pool
+    is closed when the interpreter exits.
+    """
+    http_client = httpx.Client(
+        http2=True,
+        timeout=httpx.Timeout(timeout, connect=30.0),
+        limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60),
+    )
+    atexit.register(http_client.close)
+    return DeepgramClient(api_key=DEEPGRAM_API_KEY, httpx_client=http_client)
+
+
 def transcribe_audio(
     audio_path: Path,
     language: str = DEFAULT_LANGUAGE,
     diarize: bool = False,
     filler_words: bool = False,
     timeout: int = 600,
+    quiet: bool = False,
 ) -> dict:
     """Transcribe audio file using Deepgram API.
 
@@ -113,6 +309,7 @@ def transcribe_audio(
         diarize: Enable speaker diarization
         filler_words: Include filler words like 'um', 'uh'
         timeout: API timeout in seconds (default: 600 for large files)
+        quiet: Skip the settings banner (for parallel transcriptions)
 
     Returns:
         Deepgram API response as dictionary
@@ -123,67 +320,115 @@ def transcribe_audio(
             "Please set it in your environment or .env file."
         )
 
-    # Get file size for info
-    file_size_mb = audio_path.stat().st_size / (1024 * 1024)
-
-    print(f"Transcribing: {audio_path}")
-    print(f"  File size: {file_size_mb:.1f} MB")
-    print(f"  Language: {language}")
-    print(f"  Diarize: {diarize}")
-    print(f"  Filler words: {filler_words}")
-    print(f"  Timeout: {timeout}s")
-
-    # Create client with custom httpx client for longer timeout
-    http_client = httpx.Client(timeout=httpx.Timeout(timeout, connect=30.0))
-    client = DeepgramClient(api_key=DEEPGRAM_API_KEY, httpx_client=http_client)
-
-    with open(audio_path, "rb") as audio_file:
-        audio_data = audio_file.read()
-
-    # Detect mimetype based on file extension
-    suffix = audio_path.suffix.lower()
-    mimetype_map = {
-        ".mp3": "audio/mp3",
-        ".wav": "audio/wav",
-        ".m4a": "audio/m4a",
-        ".ogg": "audio/ogg",
-        ".flac": "audio/flac",
-        ".webm": "audio/webm",
-    }
-    mimetype = mimetype_map.get(suffix, "audio/mp3")
+    if not quiet:
+        # Get file size for info
+        file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+
+        print(f"Transcribing: {audio_path}")
+        print(f"  File size: {file_size_mb:.1f} MB")
+        print(f"  Language: {language}")
+        print(f"  Diarize: {diarize}")
+        print(f"  Filler words: {filler_words}")
+        print(f"  Timeout: {timeout}s")
+
+    # Pooled client with custom httpx client for longer timeout
+    client = deepgram_client(timeout)
 
-    # Transcribe with options using v1 API
+    # Transcribe with options using v1 API. The body is streamed from disk
+    # (chunked transfer encoding) instead of being read into memory first.
     response = client.listen.v1.media.transcribe_file(
-        request=audio_data,
-        model="nova-3",
-        language=language,
-        smart_format=True,
-        punctuate=True,
-        paragraphs=True,
-        utterances=True,  # Required for SRT generation
-        filler_words=filler_words,
-        diarize=diarize,
+        request=iter_file_chunks(audio_path),
+        **transcription_options(language, diarize, filler_words),
     )
+    return response_to_dict(response)
 
-    # Convert response to dict - handle different SDK versions
-    if hasattr(response, "to_dict"):
-        return response.to_dict()
-    elif hasattr(response, "to_json"):
-        return json.loads(response.to_json())
-    elif hasattr(response, "model_dump"):
-        return response.model_dump()
-    elif hasattr(response, "result"):
-        # v1 API might wrap result
-        result = response.result
-        if hasattr(result, "to_dict"):
-            return result.to_dict()
-        elif hasattr(result, "to_json"):
-            return json.loads(result.to_json())
-    # Fallback: try to access as dict-like or use __dict__
-    try:
-        return dict(response)
-    except (TypeError, ValueError):
-        return response.__dict__
+
+def duplicate_stems(paths: list[Path]) -> dict[str, list[Path]]:
+    """Group paths whose outputs would collide (same stem), e.g. a/clip.mp3 and b/clip.wav."""
+    by_stem: dict[str, list[Path]] = {}
+    for path in paths:
+        by_stem.setdefault(path.stem, []).append(path)
+    return {stem: group for stem, group in by_stem.items() if len(group) > 1}
+
+
+async def transcribe_many(
+    paths: list[Path],
+    output_dir: Path,
+    language: str = DEFAULT_LANGUAGE,
+    diarize: bool = False,
+    filler_words: bool = False,
+    timeout: int = 600,
+    srt_mode: str = "utterances",
+    concurrency: int = 8,
+    use_cache: bool = True,
+    force: bool = False,
+) -> list[tuple[Path, Exception | None]]:
+    """Transcribe many audio files concurrently and save results for each.
+
+    Up to `concurrency` uploads are in flight at once over one pooled
+    HTTP/2 client. A failing file does not stop the others. Files with a
+    memoized response are not sent again unless `force` is set.
+
+    Args:
+        paths: Audio files to transcribe
+        output_dir: Output directory (files are named after each path's stem)
+        language: Language code (e.g., 'ru', 'en')
+        diarize: Enable speaker diarization
+        filler_words: Include filler words like 'um', 'uh'
+        timeout: API timeout in seconds per file
+        srt_mode: SRT generation mode, see save_results()
+        concurrency: Max files transcribed at the same time
+        use_cache: Read and write memoized responses
+        force: Ignore memoized responses (still refresh them if use_cache)
+
+    Returns:
+        (path, error) per input file; error is None on success
+
+    Raises:
+        ValueError: If two paths share a stem, since their outputs would
+            overwrite each other. Nothing is sent in that case.
+    """
+    if not DEEPGRAM_API_KEY:
+        raise RuntimeError(
+            "DEEPGRAM_API_KEY is not set. "
+            "Please set it in your environment or .env file."
+        )
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    duplicates = duplicate_stems(paths)
+    if duplicates:
+        groups = "; ".join(", ".join(map(str, group)) for group in duplicates.values())
+        raise ValueError(f"Files would write the same outputs: {groups}")
+
+    options = transcription_options(language, diarize, filler_words)
+    semaphore = asyncio.Semaphore(concurrency)
+    http_client = httpx.AsyncClient(http2=True, timeout=httpx.Timeout(timeout, connect=30.0))
+    client = AsyncDeepgramClient(api_key=DEEPGRAM_API_KEY, httpx_client=http_client)
+
+    async def transcribe_one(path: Path) -> None:
+        cache_path = response_cache_path(output_dir, path, options)
+        response = None
+        if use_cache and not force:
+            response = await asyncio.to_thread(load_cached_response, cache_path)
+        if response is None:
+            async with semaphore:
+                print(f"Transcribing: {path}")
+                sdk_response = await client.listen.v1.media.transcribe_file(
+                    request=aiter_file_chunks(path), **options
+                )
+            response = response_to_dict(sdk_response)
+            if use_cache:
+                await asyncio.to_thread(store_cached_response, cache_path, response)
+        else:
+            print(f"Using cached transcription: {path}")
+        # Multi-MB JSON/SRT writes; keep them off the loop so other uploads keep flowing
+        await asyncio.to_thread(save_results, response, output_dir, path.stem, srt_mode=srt_mode)
+
+    async with http_client:
+        outcomes = await asyncio.gather(
+            *(transcribe_one(path) for path in paths), return_exceptions=True
+        )
+    return list(zip(paths, outcomes))
 
 
 def format_srt_timestamp(seconds: float) -> str:
@@ -195,45 +440,55 @@ def format_srt_timestamp(seconds: float) -> str:
     Returns:
         Formatted timestamp string
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
+    # Integer milliseconds, rounded: float "% 1" truncates 4.537 to 536 ms
+    secs, millis = divmod(round(seconds * 1000), 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
-def generate_srt_from_paragraphs(response: dict) -> str:
+def first_alternative(response: dict) -> dict:
+    """Return the first channel's top alternative, or {} if there is none."""
+    channels = response.get("results", {}).get("channels") or [{}]
+    alternatives = channels[0].get("alternatives") or [{}]
+    return alternatives[0]
+
+
+def generate_srt_from_paragraphs(alternative: dict) -> str:
     """Generate SRT content from paragraphs instead of utterances.
 
     This produces longer, more readable subtitle segments compared to
     the default utterance-based generation.
 
     Args:
-        response: Deepgram API response dictionary
+        alternative: The response's first alternative (see first_alternative)
 
     Returns:
         SRT formatted string
     """
-    paragraphs = (
-        response.get("results", {})
-        .get("channels", [{}])[0]
-        .get("alternatives", [{}])[0]
-        .get("paragraphs", {})
-        .get("paragraphs", [])
-    )
+    paragraphs = alternative.get("paragraphs", {}).get("paragraphs", [])
 
     if not paragraphs:
         raise ValueError("No paragraphs found in response. Ensure paragraphs=True in API call.")
 
-    srt_lines = []
+    # Flat list of small pieces joined once, instead of a string per cue
+    parts = []
+    append = parts.append
+    get_text = operator.itemgetter("text")
     for i, para in enumerate(paragraphs, 1):
-        start = format_srt_timestamp(para["start"])
-        end = format_srt_timestamp(para["end"])
+        append(str(i))
+        append("\n")
+        append(format_srt_timestamp(para["start"]))
+        append(" --> ")
+        append(format_srt_timestamp(para["end"]))
+        append("\n")
         # Combine all sentences in the paragraph
-        text = " ".join(s["text"] for s in para.get("sentences", []))
-        srt_lines.append(f"{i}\n{start} --> {end}\n{text}\n")
+        append(" ".join(map(get_text, para.get("sentences", []))))
+        append("\n\n")
+    # Cues are separated by a blank line; the last one ends with a single newline
+    parts[-1] = "\n"
 
-    return "\n".join(srt_lines)
+    return "".join(parts)
 
 
 def save_results(
@@ -241,6 +496,7 @@ def save_results(
     output_dir: Path,
     video_id: str,
     srt_mode: str = "utterances",
+    quiet: bool = False,
 ) -> tuple[Path, Path, Path]:
     """Save transcription results to files.
 
@@ -250,53 +506,41 @@ def save_results(
         video_id: YouTube video ID
         srt_mode: SRT generation mode - "utterances" (short segments) or
                   "paragraphs" (longer, more readable segments)
+        quiet: Don't print a line per saved file (warnings are still printed)
 
     Returns:
         Tuple of (json_path, srt_path, txt_path)
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Custom JSON encoder for datetime objects
-    def json_serializer(obj):
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
-
     # Save full JSON response
     json_path = output_dir / f"{video_id}.json"
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(response, f, ensure_ascii=False, indent=2, default=json_serializer)
-    print(f"JSON saved: {json_path}")
+    write_atomic(json_path, dump_json(response, indent=True))
+    if not quiet:
+        print(f"JSON saved: {json_path}")
 
-    # Extract plain text transcript
-    transcript = ""
-    try:
-        channels = response.get("results", {}).get("channels", [])
-        if channels:
-            alternatives = channels[0].get("alternatives", [])
-            if alternatives:
-                transcript = alternatives[0].get("transcript", "")
-    except (KeyError, IndexError) as e:
-        print(f"Warning: Could not extract transcript: {e}")
+    # Transcript and SRT both read the same alternative; look it up once
+    alternative = first_alternative(response)
+    transcript = alternative.get("transcript", "")
 
     # Save plain text
     txt_path = output_dir / f"{video_id}.txt"
-    with open(txt_path, "w", encoding="utf-8") as f:
-        f.write(transcript)
-    print(f"TXT saved: {txt_path}")
+    write_atomic(txt_path, transcript.encode("utf-8"))
+    if not quiet:
+        print(f"TXT saved: {txt_path}")
 
     # Generate and save SRT
     srt_path = output_dir / f"{video_id}.srt"
     try:
         if srt_mode == "paragraphs":
-            srt_content = generate_srt_from_paragraphs(response)
+            srt_content = generate_srt_from_paragraphs(alternative)
         else:
             # Default: use deepgram-captions with utterances
             converter = DeepgramConverter(response)
             srt_content = srt(converter)
-        with open(srt_path, "w", encoding="utf-8") as f:
-            f.write(srt_content)
-        print(f"SRT saved: {srt_path} (mode: {srt_mode})")
+        write_atomic(srt_path, srt_content.encode("utf-8"))
+        if not quiet:
+            print(f"SRT saved: {srt_path} (mode: {srt_mode})")
     except Exception as e:
         print(f"Warning: Could not generate SRT: {e}")
         srt_path = None
@@ -304,6 +548,14 @@ def save_results(
     return json_path, srt_path, txt_path
 
 
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(
@@ -319,6 +571,12 @@ Examples:
   %(prog)s --audio-file path/to/audio.mp3
   %(prog)s -a recording.wav --language en --diarize
 
+  # Many local files concurrently
+  %(prog)s --batch recordings/ --concurrency 4
+
+  # Many YouTube videos, downloading ahead while others transcribe
+  %(prog)s --urls playlist.txt --download-workers 4
+
 Environment:
   DEEPGRAM_API_KEY    Your Deepgram API key (required)
 
@@ -338,6 +596,27 @@ Note:
         type=Path,
         help="Path to local audio file (skip YouTube download)",
     )
+    parser.add_argument(
+        "--batch",
+        help="Directory or glob of local audio files to transcribe concurrently",
+    )
+    parser.add_argument(
+        "--urls",
+        type=Path,
+        help="Text file with one YouTube URL or video ID per line",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=positive_int,
+        default=8,
+        help="Max files transcribed at once in --batch/--urls mode (default: 8)",
+    )
+    parser.add_argument(
+        "--download-workers",
+        type=positive_int,
+        default=4,
+        help="Parallel YouTube downloads in --urls mode (default: 4)",
+    )
     parser.add_argument(
         "-l",
         "--language",
@@ -379,9 +658,164 @@ Note:
         help="SRT generation mode: 'utterances' for short segments (default), "
         "'paragraphs' for longer, more readable segments",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write memoized Deepgram responses",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Transcribe again even if a memoized response exists",
+    )
     return parser.parse_args()
 
 
+def run_batch(args: argparse.Namespace, output_dir: Path) -> int:
+    """Transcribe every audio file matched by --batch."""
+    batch_dir = Path(args.batch)
+    if batch_dir.is_dir():
+        paths = sorted(p for p in batch_dir.iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS)
+    else:
+        paths = sorted(Path(p) for p in glob.glob(args.batch))
+    if not paths:
+        print(f"Error: No audio files found for: {args.batch}", file=sys.stderr)
+        return 1
+    duplicates = duplicate_stems(paths)
+    if duplicates:
+        # Outputs are named after the stem, so these would overwrite each other
+        print(
+            "Error: Files with the same name would overwrite each other's outputs:",
+            file=sys.stderr,
+        )
+        for group in duplicates.values():
+            print(f"  {', '.join(map(str, group))}", file=sys.stderr)
+        return 1
+
+    print(f"Transcribing {len(paths)} files (concurrency: {args.concurrency})")
+    outcomes = asyncio.run(
+        transcribe_many(
+            paths,
+            output_dir,
+            language=args.language,
+            diarize=args.diarize,
+            filler_words=args.filler_words,
+            timeout=args.timeout,
+            srt_mode=args.srt_mode,
+            concurrency=args.concurrency,
+            use_cache=not args.no_cache,
+            force=args.force,
+        )
+    )
+
+    failed = [(path, error) for path, error in outcomes if error is not None]
+    for path, error in failed:
+        print(f"Error: {path}: {error}", file=sys.stderr)
+    print(f"\nBatch complete: {len(paths) - len(failed)} succeeded, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+def run_pipeline(args: argparse.Namespace, output_dir: Path) -> int:
+    """Download and transcribe every video listed in --urls, overlapping the two.
+
+    Download workers fetch audio ahead into a bounded queue while transcription
+    workers upload finished files to Deepgram, so the network is busy with
+    downloads while earlier videos are being transcribed and vice versa.
+    """
+    urls = [
+        line.strip()
+        for line in args.urls.read_text(encoding="utf-8").splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    if not urls:
+        print(f"Error: No URLs found in: {args.urls}", file=sys.stderr)
+        return 1
+
+    options = transcription_options(args.language, args.diarize, args.filler_words)
+    use_cache = not args.no_cache
+    audio_queue: queue.Queue[tuple[str, str, Path] | None] = queue.Queue(PIPELINE_QUEUE_SIZE)
+    failed: list[tuple[str, Exception]] = []
+    # Set on interrupt: downloads and transcriptions not yet started are skipped
+    stop = threading.Event()
+    print_lock = threading.Lock()
+
+    # Workers print one line per video; the per-step output would interleave
+    def report(message: str) -> None:
+        with print_lock:
+            print(message)
+
+    def download(url: str) -> None:
+        if stop.is_set():
+            return
+        try:
+            video_id = extract_video_id(url)
+            if not video_id:
+                raise ValueError(f"Could not extract video ID from: {url}")
+            if use_cache and not args.force:
+                response = load_cached_response(response_cache_path(output_dir, video_id, options))
+                if response is not None:
+                    save_results(response, output_dir, video_id, srt_mode=args.srt_mode, quiet=True)
+                    report(f"Cached: {url}")
+                    return
+            audio_queue.put((url, video_id, download_audio(url, output_dir, quiet=True)))
+        except Exception as e:
+            failed.append((url, e))
+
+    def transcribe_queued() -> None:
+        while (item := audio_queue.get()) is not None:
+            if stop.is_set():
+                continue
+            url, video_id, audio_path = item
+            try:
+                response = transcribe_audio(
+                    audio_path,
+                    language=args.language,
+                    diarize=args.diarize,
+                    filler_words=args.filler_words,
+                    timeout=args.timeout,
+                    quiet=True,
+                )
+                if use_cache:
+                    store_cached_response(
+                        response_cache_path(output_dir, video_id, options), response
+                    )
+                json_path, _, _ = save_results(
+                    response, output_dir, video_id, srt_mode=args.srt_mode, quiet=True
+                )
+                if args.delete_audio:
+                    audio_path.unlink()
+                report(f"Transcribed: {url} -> {json_path}")
+            except Exception as e:
+                failed.append((url, e))
+
+    print(
+        f"Processing {len(urls)} videos "
+        f"(downloads: {args.download_workers}, transcriptions: {args.concurrency})"
+    )
+    transcribers = ThreadPoolExecutor(max_workers=args.concurrency)
+    downloaders = ThreadPoolExecutor(max_workers=args.download_workers)
+    try:
+        for _ in range(args.concurrency):
+            transcribers.submit(transcribe_queued)
+        wait([downloaders.submit(download, url) for url in urls])
+    except BaseException:
+        # Ctrl-C: let running work finish but start nothing new
+        stop.set()
+        raise
+    finally:
+        downloaders.shutdown(cancel_futures=True)
+        # One stop marker per transcription worker, after every download is queued;
+        # also on interrupt, or the workers would block in get() forever
+        for _ in range(args.concurrency):
+            audio_queue.put(None)
+        transcribers.shutdown()
+
+    for url, error in failed:
+        print(f"Error: {url}: {error}", file=sys.stderr)
+    print(f"\nPipeline complete: {len(urls) - len(failed)} succeeded, {len(failed)} failed")
+    return 1 if failed else 0
+
+
 def main() -> int:
     """Main entry point."""
     args = parse_args()
@@ -392,14 +826,22 @@ def main() -> int:
         print("Please set it in your environment or .env file.", file=sys.stderr)
         return 1
 
-    # Validate inputs: need either URL or audio file
-    if not args.url and not args.audio_file:
-        print("Error: Must provide either a YouTube URL or --audio-file.", file=sys.stderr)
+    # Validate inputs: need a URL, an audio file, a batch or a URL list
+    if not args.url and not args.audio_file and not args.batch and not args.urls:
+        print(
+            "Error: Must provide a YouTube URL, --audio-file, --batch or --urls.",
+            file=sys.stderr,
+        )
         return 1
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    if args.batch:
+        return run_batch(args, output_dir)
+    if args.urls:
+        return run_pipeline(args, output_dir)
+
     try:
         # Determine source: local file or YouTube
         if args.audio_file:
@@ -411,25 +853,40 @@ def main() -> int:
             # Use filename stem as the ID
             file_id = audio_path.stem
             print(f"Using local audio file: {audio_path}")
-            downloaded = False
         else:
-            # Download from YouTube
             video_id = extract_video_id(args.url)
             if not video_id:
                 print(f"Error: Could not extract video ID from: {args.url}", file=sys.stderr)
                 return 1
-            audio_path = download_audio(args.url, output_dir)
+            audio_path = None
             file_id = video_id
-            downloaded = True
-
-        # Transcribe
-        response = transcribe_audio(
-            audio_path,
-            language=args.language,
-            diarize=args.diarize,
-            filler_words=args.filler_words,
-            timeout=args.timeout,
-        )
+        downloaded = False
+
+        # Reuse a memoized response for the same file and options if there is one
+        options = transcription_options(args.language, args.diarize, args.filler_words)
+        cache_path = response_cache_path(output_dir, audio_path or file_id, options)
+        response = None
+        if not args.no_cache and not args.force:
+            response = load_cached_response(cache_path)
+            if response is not None:
+                print(f"Using cached transcription: {cache_path}")
+
+        if response is None:
+            if audio_path is None:
+                # Download from YouTube
+                audio_path = download_audio(args.url, output_dir)
+                downloaded = True
+
+            # Transcribe
+            response = transcribe_audio(
+                audio_path,
+                language=args.language,
+                diarize=args.diarize,
+                filler_words=args.filler_words,
+                timeout=args.timeout,
+            )
+            if not args.no_cache:
+                store_cached_response(cache_path, response)
 
         # Save results
         json_path, srt_path, txt_path = save_results(
@@ -446,7 +903,7 @@ def main() -> int:
         print(f"  JSON: {json_path}")
         print(f"  SRT: {srt_path}")
         print(f"  TXT: {txt_path}")
-        if not args.delete_audio or not downloaded:
+        if audio_path is not None and (not args.delete_audio or not downloaded):
             print(f"  Audio: {audio_path}")
 
         return 0
@@ -0,0 +1,84 @@
+"""Tests for src/transcribe.py."""
+
+from deepgram.types import ListenV1Response
+
+from transcribe import (
+    load_cached_response,
+    response_to_dict,
+    save_results,
+    store_cached_response,
+)
+
+
+def _word(word: str, start: float, end: float) -> dict:
+    return {"word": word, "start": start, "end": end, "confidence": 0.99, "punctuated_word": word}
+
+
+SAMPLE_RESPONSE = {
+    "metadata": {
+        "request_id": "00000000-0000-0000-0000-000000000000",
+        "sha256": "0" * 64,
+        "created": "2025-01-01T12:00:00.000Z",
+        "duration": 4.5,
+        "channels": 1,
+        "models": ["model-id"],
+        "model_info": {"model-id": {"name": "nova-3", "version": "1", "arch": "nova-3"}},
+    },
+    "results": {
+        "channels": [
+            {
+                "alternatives": [
+                    {
+                        "transcript": "Привет мир. Как дела?",
+                        "confidence": 0.99,
+                        "words": [
+                            _word("Привет", 0.0, 0.5),
+                            _word("мир.", 0.5, 1.0),
+                            _word("Как", 2.0, 2.5),
+                            _word("дела?", 2.5, 3.0),
+                        ],
+                    }
+                ]
+            }
+        ],
+        "utterances": [
+            {
+                "start": 0.0,
+                "end": 1.0,
+                "confidence": 0.99,
+                "channel": 0,
+                "transcript": "Привет мир.",
+                "words": [_word("Привет", 0.0, 0.5), _word("мир.", 0.5, 1.0)],
+                "speaker": 0,
+                "id": "a",
+            },
+            {
+                "start": 2.0,
+                "end": 3.0,
+                "confidence": 0.99,
+                "channel": 0,
+                "transcript": "Как дела?",
+                "words": [_word("Как", 2.0, 2.5), _word("дела?", 2.5, 3.0)],
+                "speaker": 0,
+                "id": "b",
+            },
+        ],
+    },
+}
+
+
+def test_cached_response_reloads_into_the_same_outputs(tmp_path):
+    response = response_to_dict(ListenV1Response.model_validate(SAMPLE_RESPONSE))
+    fresh_dir, cached_dir = tmp_path / "fresh", tmp_path / "cached"
+
+    fresh = save_results(response, fresh_dir, "clip", quiet=True)
+    cache_path = tmp_path / ".cache" / "clip.json"
+    store_cached_response(cache_path, response)
+    cached = save_results(load_cached_response(cache_path), cached_dir, "clip", quiet=True)
+
+    assert load_cached_response(cache_path) == response
+    assert fresh[1] is not None and cached[1] is not None
+    srt = fresh[1].read_text(encoding="utf-8")
+    assert "00:00:00,000 --> 00:00:01,000\nПривет мир." in srt
+    for fresh_path, cached_path in zip(fresh, cached):
+        assert cached_path.read_bytes() == fresh_path.read_bytes()